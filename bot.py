@@ -1,4 +1,5 @@
 """UN Discord Bot - Main Application"""
+import asyncio
 import discord
 from discord.ext import commands
 import logging
@@ -6,20 +7,22 @@ import os
 import sys
 from typing import Optional
 
-from src.config import BOT_TOKEN, DEBUG
+from src.config import (
+    BOT_TOKEN, DEBUG, SHARD_MODE, SHARD_COUNT, SHARD_IDS, HEALTH_REPORT_INTERVAL, HEALTH_DIR,
+    DEV_GUILD_ID
+)
 from src.data_manager import DataManager
 from src.rate_limiter import RateLimiter
 from src.commands import UNBotCommands
+from src.un_scraper import UNScraper
+from src.feed_scheduler import FeedScheduler
+from src.resolution_catalog import ResolutionCatalog, current_periods, ingest
+from src.sharding import parse_shard_ids, is_primary, shard_health, write_health
+from src.logging_setup import setup_logging
+from src.command_sync import sync_commands
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging, written by a background thread so handlers never block the event loop
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Bot configuration
@@ -27,42 +30,126 @@ intents = discord.Intents.default()
 intents.guilds = True
 # Note: message_content intent not needed for slash commands
 
-bot = commands.Bot(
+# Shards this process runs; launcher.py gives each worker process its own range
+shard_ids = parse_shard_ids(SHARD_IDS)
+BotBase = commands.AutoShardedBot if SHARD_MODE == 'auto' else commands.Bot
+shard_options = {'shard_count': SHARD_COUNT, 'shard_ids': shard_ids} if SHARD_MODE == 'auto' else {}
+
+class UNBot(BotBase):
+    """Bot that owns the lifecycle of long-lived services"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Background tasks started by setup_hook, which never runs if login fails
+        self.charter_task: Optional[asyncio.Task] = None
+        self.resolution_task: Optional[asyncio.Task] = None
+        self.watch_task: Optional[asyncio.Task] = None
+        self.health_task: Optional[asyncio.Task] = None
+    
+    async def setup_hook(self):
+        """Start services before connecting to the gateway"""
+        await scraper.start()
+        # Work shared by the whole deployment runs in one process only; the other workers
+        # pick up the written Charter file through their data file watcher
+        if is_primary(shard_ids):
+            self.charter_task = asyncio.create_task(refresh_online_charter())
+            self.resolution_task = asyncio.create_task(ingest(scraper, catalog, current_periods()))
+        feeds.start()
+        self.watch_task = asyncio.create_task(data_manager.watch())
+        self.health_task = asyncio.create_task(report_health())
+        
+        # Sync the command tree once per start rather than on every (re)connect, and only
+        # from one process when sharded across several
+        if is_primary(shard_ids):
+            try:
+                await sync_commands(self.tree, DEV_GUILD_ID)
+            except Exception as e:
+                logger.error("Failed to sync commands: %s", e)
+    
+    async def close(self):
+        """Shut down services, then disconnect"""
+        for task in (self.charter_task, self.resolution_task, self.watch_task, self.health_task):
+            if task is not None:
+                task.cancel()
+        await feeds.stop()
+        await scraper.close()
+        rate_limiter.close()
+        catalog.close()
+        await super().close()
+
+bot = UNBot(
     command_prefix='!', 
     intents=intents,
     help_command=None,
-    case_insensitive=True
+    case_insensitive=True,
+    **shard_options
 )
 
 # Initialize components
 data_manager = DataManager()
 rate_limiter = RateLimiter()
-command_handler = UNBotCommands(data_manager, rate_limiter)
+scraper = UNScraper()
+feeds = FeedScheduler(scraper)
+catalog = ResolutionCatalog()
+command_handler = UNBotCommands(data_manager, rate_limiter, scraper, feeds, catalog)
+logger.info("Prebuilt %s embed(s)", command_handler.warm_embed_cache())
+
+async def refresh_online_charter():
+    """Ingest the official Charter in the background so article lookups never parse HTML"""
+    articles = await scraper.ingest_charter()
+    if articles:
+        data_manager.store_charter_online(articles)
+
+async def report_health():
+    """Periodically log, and optionally write out, the status of each shard and the parse pool"""
+    await bot.wait_until_ready()
+    while True:
+        try:
+            report = shard_health(bot)
+            for shard in report:
+                logger.info("Shard %s: %s guilds, latency %sms, closed=%s",
+                            shard['shard_id'], shard['guilds'], shard['latency_ms'], shard['closed'])
+            parsing = scraper.parse_report()
+            logger.info("Parse pool: queue depth %s (peak %s), %s running, %s completed",
+                        parsing['queue_depth'], parsing['peak_depth'], parsing['running'], parsing['completed'])
+            if HEALTH_DIR:
+                write_health(report, HEALTH_DIR)
+        except Exception as e:
+            logger.error("Error reporting shard health: %s", e)
+        await asyncio.sleep(HEALTH_REPORT_INTERVAL)
 
 @bot.event
 async def on_ready():
     """Bot ready event"""
-    logger.info(f'{bot.user} has connected to Discord!')
-    logger.info(f'Bot is in {len(bot.guilds)} guilds')
+    logger.info("%s has connected to Discord!", bot.user)
+    logger.info("Bot is in %s guilds", len(bot.guilds))
     print(f'🌍 UN Bot is online and ready to serve!')
     print(f'📊 Connected to {len(bot.guilds)} servers')
-    
-    # Sync command tree
-    try:
-        synced = await bot.tree.sync()
-        logger.info(f"Synced {len(synced)} command(s)")
-    except Exception as e:
-        logger.error(f"Failed to sync commands: {e}")
+
+@bot.event
+async def on_shard_ready(shard_id):
+    """Log when a shard has connected"""
+    logger.info("Shard %s ready", shard_id)
+
+@bot.event
+async def on_shard_disconnect(shard_id):
+    """Log when a shard loses its gateway connection"""
+    logger.warning("Shard %s disconnected", shard_id)
+
+@bot.event
+async def on_shard_resumed(shard_id):
+    """Log when a shard resumes its gateway session"""
+    logger.info("Shard %s resumed", shard_id)
 
 @bot.event
 async def on_guild_join(guild):
     """Log when bot joins a new guild"""
-    logger.info(f'Joined guild: {guild.name} (ID: {guild.id})')
+    logger.info("Joined guild: %s (ID: %s)", guild.name, guild.id)
 
 @bot.event
 async def on_guild_remove(guild):
     """Log when bot leaves a guild"""
-    logger.info(f'Left guild: {guild.name} (ID: {guild.id})')
+    logger.info("Left guild: %s (ID: %s)", guild.name, guild.id)
 
 # Slash Commands using discord.py application commands
 @bot.tree.command(
@@ -71,11 +158,15 @@ async def on_guild_remove(guild):
 )
 async def charter(interaction: discord.Interaction, article: int):
     """Retrieve UN Charter article by number"""
-    try:
-        await command_handler.charter(interaction, article)
-    except Exception as e:
-        logger.error(f"Error in charter command: {e}")
-        await interaction.response.send_message("❌ An error occurred while retrieving the charter article. Please try again later.", ephemeral=True)
+    await command_handler.run(
+        interaction, command_handler.charter, article,
+        error="❌ An error occurred while retrieving the charter article. Please try again later."
+    )
+
+@charter.autocomplete('article')
+async def charter_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggest charter articles as the user types"""
+    return await command_handler.charter_autocomplete(interaction, current)
 
 @bot.tree.command(
     name="resolution",
@@ -83,11 +174,10 @@ async def charter(interaction: discord.Interaction, article: int):
 )
 async def resolution(interaction: discord.Interaction, type: str, number: int):
     """Search for UN resolutions"""
-    try:
-        await command_handler.resolution(interaction, type, number)
-    except Exception as e:
-        logger.error(f"Error in resolution command: {e}")
-        await interaction.response.send_message("❌ An error occurred while searching for the resolution. Please try again later.", ephemeral=True)
+    await command_handler.run(
+        interaction, command_handler.resolution, type, number,
+        error="❌ An error occurred while searching for the resolution. Please try again later."
+    )
 
 @bot.tree.command(
     name="policy",
@@ -95,11 +185,15 @@ async def resolution(interaction: discord.Interaction, type: str, number: int):
 )
 async def policy(interaction: discord.Interaction, term: str):
     """Get UN policy definition"""
-    try:
-        await command_handler.policy(interaction, term)
-    except Exception as e:
-        logger.error(f"Error in policy command: {e}")
-        await interaction.response.send_message("❌ An error occurred while retrieving the policy definition. Please try again later.", ephemeral=True)
+    await command_handler.run(
+        interaction, command_handler.policy, term,
+        error="❌ An error occurred while retrieving the policy definition. Please try again later."
+    )
+
+@policy.autocomplete('term')
+async def policy_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggest policy terms as the user types"""
+    return await command_handler.policy_autocomplete(interaction, current)
 
 @bot.tree.command(
     name="search",
@@ -107,11 +201,15 @@ async def policy(interaction: discord.Interaction, term: str):
 )
 async def search(interaction: discord.Interaction, query: str):
     """Search for UN Charter articles or policy terms"""
-    try:
-        await command_handler.search(interaction, query)
-    except Exception as e:
-        logger.error(f"Error in search command: {e}")
-        await interaction.response.send_message("❌ An error occurred while searching. Please try again later.", ephemeral=True)
+    await command_handler.run(
+        interaction, command_handler.search, query,
+        error="❌ An error occurred while searching. Please try again later."
+    )
+
+@search.autocomplete('query')
+async def search_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggest search topics as the user types"""
+    return await command_handler.search_autocomplete(interaction, current)
 
 @bot.tree.command(
     name="latest",
@@ -119,11 +217,10 @@ async def search(interaction: discord.Interaction, query: str):
 )
 async def latest(interaction: discord.Interaction):
     """Get latest UN news and updates"""
-    try:
-        await command_handler.latest(interaction)
-    except Exception as e:
-        logger.error(f"Error in latest command: {e}")
-        await interaction.response.send_message("❌ An error occurred while retrieving the latest news. Please try again later.", ephemeral=True)
+    await command_handler.run(
+        interaction, command_handler.latest,
+        error="❌ An error occurred while retrieving the latest news. Please try again later."
+    )
 
 @bot.tree.command(
     name="help",
@@ -131,17 +228,29 @@ async def latest(interaction: discord.Interaction):
 )
 async def help_command(interaction: discord.Interaction):
     """Show help information"""
-    try:
-        await command_handler.help_command(interaction)
-    except Exception as e:
-        logger.error(f"Error in help command: {e}")
-        await interaction.response.send_message("❌ An error occurred while retrieving help. Please try again later.", ephemeral=True)
+    await command_handler.run(
+        interaction, command_handler.help_command,
+        error="❌ An error occurred while retrieving help. Please try again later."
+    )
+
+@bot.tree.command(
+    name="reload",
+    description="Reloads the charter and policy data files (administrators only)"
+)
+@discord.app_commands.default_permissions(administrator=True)
+@discord.app_commands.guild_only()
+async def reload(interaction: discord.Interaction):
+    """Reload data files without restarting"""
+    await command_handler.run(
+        interaction, command_handler.reload_data,
+        error="❌ An error occurred while reloading the data files. Please check the logs."
+    )
 
 # Error handling
 @bot.event
 async def on_application_command_error(interaction: discord.Interaction, error):
     """Handle application command errors"""
-    logger.error(f"Application command error in {interaction.command}: {error}")
+    logger.error("Application command error in %s: %s", interaction.command, error)
     
     if isinstance(error, commands.CommandOnCooldown):
         await interaction.response.send_message(f"⏳ This command is on cooldown. Try again in {error.retry_after:.1f} seconds.", ephemeral=True)
@@ -153,13 +262,13 @@ async def on_application_command_error(interaction: discord.Interaction, error):
         else:
             await interaction.response.send_message("❌ A Discord API error occurred. Please try again later.", ephemeral=True)
     else:
-        logger.error(f"Unhandled error: {error}", exc_info=True)
+        logger.error("Unhandled error: %s", error, exc_info=True)
         await interaction.response.send_message("❌ An unexpected error occurred. Please try again later.", ephemeral=True)
 
 @bot.event
 async def on_error(event, *args, **kwargs):
     """Handle general bot errors"""
-    logger.error(f"Error in event {event}:", exc_info=True)
+    logger.error("Error in event %s:", event, exc_info=True)
 
 def main():
     """Main function to run the bot"""
@@ -174,11 +283,12 @@ def main():
     
     logger.info("Starting UN Discord Bot...")
     try:
-        bot.run(BOT_TOKEN)
+        # Logging is already configured, skip discord.py's own blocking handler
+        bot.run(BOT_TOKEN, log_handler=None)
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
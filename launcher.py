@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Run the bot as several processes, each owning a contiguous range of shards"""
+import argparse
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+from src.config import BOT_TOKEN, SHARD_COUNT
+from src.sharding import format_shard_ids, shard_ranges
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - launcher - %(levelname)s - %(message)s')
+logger = logging.getLogger('launcher')
+
+# Restart delay after a worker exits, doubled per consecutive crash up to the cap
+RESTART_DELAY = 5.0
+MAX_RESTART_DELAY = 300.0
+# A worker that stayed up this long resets its crash count
+STABLE_AFTER = 600.0
+# Discord allows one shard to identify every 5 seconds, so workers start staggered
+IDENTIFY_INTERVAL = 5.0
+
+def recommended_shards(token: str) -> int:
+    """Ask Discord how many shards the bot should run"""
+    request = urllib.request.Request(
+        'https://discord.com/api/v10/gateway/bot',
+        headers={'Authorization': f'Bot {token}', 'User-Agent': 'UNBot launcher'}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)['shards']
+
+class Worker:
+    """One bot process running a range of shards, restarted when it exits"""
+    
+    def __init__(self, shard_ids: List[int], shard_count: int):
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.crashes = 0
+        self.restart_at = 0.0
+    
+    @property
+    def name(self) -> str:
+        return f"shards {format_shard_ids(self.shard_ids)}"
+    
+    def start(self) -> None:
+        shard_spec = format_shard_ids(self.shard_ids)
+        # Each worker rotates its own log file, rotation is not safe across processes
+        env = dict(os.environ, SHARD_MODE='auto', SHARD_COUNT=str(self.shard_count), SHARD_IDS=shard_spec,
+                   LOG_FILE=f"bot-shards-{shard_spec}.log")
+        self.process = subprocess.Popen([sys.executable, 'bot.py'], env=env)
+        self.started_at = time.monotonic()
+        logger.info("Started %s (pid %s)", self.name, self.process.pid)
+    
+    def poll(self) -> None:
+        """Schedule a restart if the process exited, start it once the delay passed"""
+        now = time.monotonic()
+        if self.process is None:
+            if now >= self.restart_at:
+                self.start()
+            return
+        
+        code = self.process.poll()
+        if code is None:
+            return
+        
+        self.crashes = 0 if now - self.started_at > STABLE_AFTER else self.crashes + 1
+        delay = min(MAX_RESTART_DELAY, RESTART_DELAY * 2 ** max(0, self.crashes - 1))
+        logger.warning("%s exited with code %s, restarting in %.0fs", self.name, code, delay)
+        self.process = None
+        self.restart_at = now + delay
+    
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+    
+    def wait(self, timeout: float) -> None:
+        if self.process is None:
+            return
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+def main():
+    """Spawn and supervise the worker processes"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--shards', type=int, default=SHARD_COUNT,
+                        help="total shard count (default: SHARD_COUNT, else Discord's recommendation)")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help='worker processes to spread the shards over (default: CPU count)')
+    args = parser.parse_args()
+    
+    if not BOT_TOKEN:
+        print("❌ DISCORD_TOKEN not found in environment variables")
+        sys.exit(1)
+    
+    shard_count = args.shards or recommended_shards(BOT_TOKEN)
+    workers = [Worker(shard_ids, shard_count) for shard_ids in shard_ranges(shard_count, args.processes)]
+    logger.info("Running %s shard(s) in %s process(es)", shard_count, len(workers))
+    
+    stopping: Dict[str, bool] = {'requested': False}
+    
+    def request_stop(signum, frame):
+        stopping['requested'] = True
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    offset = 0.0
+    for worker in workers:
+        worker.restart_at = time.monotonic() + offset
+        offset += IDENTIFY_INTERVAL * len(worker.shard_ids)
+    while not stopping['requested']:
+        for worker in workers:
+            worker.poll()
+        time.sleep(1)
+    
+    logger.info("Stopping workers...")
+    for worker in workers:
+        worker.stop()
+    for worker in workers:
+        worker.wait(30)
+
+if __name__ == "__main__":
+    main()
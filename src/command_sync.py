@@ -0,0 +1,61 @@
+"""Sync the slash command tree with Discord only when its definitions change"""
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+import discord
+from discord import app_commands
+
+from .config import COMMAND_SYNC_FILE
+
+logger = logging.getLogger(__name__)
+
+def tree_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """SHA-256 of the command payloads a sync would upload for the given scope"""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command.get('type', 1), command['name'])
+    )
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def _load_hashes(path: str) -> Dict[str, str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _store_hashes(hashes: Dict[str, str], path: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, indent=2)
+    os.replace(tmp_path, path)
+
+async def sync_commands(tree: app_commands.CommandTree, guild_id: Optional[int] = None,
+                        path: str = COMMAND_SYNC_FILE) -> bool:
+    """
+    Sync the tree globally, or to one development guild, if it changed since the last sync
+    Hashes of the last synced payloads are persisted per scope in `path`, so restarts and
+    reconnects skip the globally rate-limited sync call. Returns whether a sync ran.
+    A guild sync copies the global commands to that guild, where updates show up at once.
+    """
+    guild = discord.Object(id=guild_id) if guild_id else None
+    # Keyed by application too, a different bot token starts from a clean slate
+    scope = f"{tree.client.application_id}:" + (f"guild:{guild_id}" if guild_id else 'global')
+    if guild is not None:
+        tree.copy_global_to(guild=guild)
+    
+    digest = tree_hash(tree, guild)
+    hashes = _load_hashes(path)
+    if hashes.get(scope) == digest:
+        logger.info("Command tree unchanged for %s, skipping sync", scope)
+        return False
+    
+    synced = await tree.sync(guild=guild)
+    hashes[scope] = digest
+    _store_hashes(hashes, path)
+    logger.info("Synced %s command(s) to %s", len(synced), scope)
+    return True
@@ -1,11 +1,20 @@
 """Command handlers for UN Discord Bot"""
+import asyncio
 import logging
-from typing import Optional
+import time
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 import discord
 from discord.ext import commands
 
 from .data_manager import DataManager
+from .config import (
+    EMBED_FIELD_LIMIT, RESOLUTION_FETCH_ON_MISS, INTERACTION_DEFER_AFTER,
+    AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_NAME_LIMIT
+)
 from .rate_limiter import RateLimiter
+from .un_scraper import UNScraper, matches_resolution
+from .feed_scheduler import FeedScheduler
+from .resolution_catalog import ResolutionCatalog
 from .utils import (
     sanitize_input, validate_article_number, validate_resolution_type, 
     validate_resolution_number, create_embed, split_content, COLORS
@@ -13,39 +22,134 @@ from .utils import (
 
 logger = logging.getLogger(__name__)
 
+# Embed attributes holding dicts that the Embed setters edit in place
+_EMBED_DICT_SLOTS = frozenset(('_footer', '_image', '_thumbnail', '_video', '_provider', '_author'))
+
+EmbedEntry = Tuple[discord.Embed, Tuple[str, ...], Tuple[str, ...]]
+
+def embed_entry(embed: discord.Embed) -> EmbedEntry:
+    """Render cache entry for an embed: the embed, its set plain slots and its set dict slots"""
+    # Embed leaves the slots of unused parts unassigned
+    slots = [slot for slot in discord.Embed.__slots__ if slot != '_fields' and hasattr(embed, slot)]
+    return (embed, tuple(slot for slot in slots if slot not in _EMBED_DICT_SLOTS),
+            tuple(slot for slot in slots if slot in _EMBED_DICT_SLOTS))
+
+def clone_embed(embed: discord.Embed, plain: Tuple[str, ...], dicts: Tuple[str, ...]) -> discord.Embed:
+    """
+    Copy a cached embed for a caller that may edit it
+    Only the field list and the nested dicts are copied, the rest is immutable and shared,
+    which is several times cheaper than Embed.copy()'s to_dict/from_dict round trip.
+    """
+    clone = discord.Embed.__new__(discord.Embed)
+    for slot in plain:
+        setattr(clone, slot, getattr(embed, slot))
+    for slot in dicts:
+        setattr(clone, slot, getattr(embed, slot).copy())
+    # set_field_at edits the field dicts in place
+    fields = getattr(embed, '_fields', None)
+    if fields is not None:
+        clone._fields = [field.copy() for field in fields]
+    return clone
+
 class UNBotCommands:
     """Command handlers for UN Discord Bot"""
     
-    def __init__(self, data_manager: DataManager, rate_limiter: RateLimiter):
+    def __init__(self, data_manager: DataManager, rate_limiter: RateLimiter,
+                 scraper: Optional[UNScraper] = None, feeds: Optional[FeedScheduler] = None,
+                 catalog: Optional[ResolutionCatalog] = None):
         self.data = data_manager
         self.rate_limiter = rate_limiter
+        self.scraper = scraper
+        self.feeds = feeds
+        self.catalog = catalog
+        # (command, key, data version) -> built embed entry, cleared when the data is reloaded
+        self._embed_cache: Dict[Tuple[str, str, int], EmbedEntry] = {}
+        self._embed_cache_version = self.data.version
+        # Interactions running under run(): id -> lock serializing their replies, and the
+        # ids already acknowledged, whose further replies must go through the followup webhook
+        self._reply_locks: Dict[int, asyncio.Lock] = {}
+        self._acknowledged: set = set()
+        # Deferred ids still showing the public "thinking" placeholder
+        self._placeholders: set = set()
     
-    async def handle_rate_limit(self, interaction: discord.Interaction, command: str) -> bool:
-        """Handle rate limiting for commands"""
-        is_limited, remaining = self.rate_limiter.is_rate_limited(interaction.user.id, command)
-        if is_limited:
-            await interaction.response.send_message(f"⏳ Please wait {remaining:.1f} seconds before using this command again.", ephemeral=True)
-            return True
-        return False
+    async def run(self, interaction: discord.Interaction, handler: Callable[..., Awaitable[None]],
+                  *args: Any, error: str = "❌ An error occurred. Please try again later.") -> None:
+        """
+        Run a command handler, deferring the interaction if it has not replied in time
+        Discord drops interactions not acknowledged within 3 seconds, so a handler still
+        working after INTERACTION_DEFER_AFTER seconds gets a deferred "thinking" response and
+        its replies are sent as followups. Errors are logged and reported with `error`.
+        """
+        started = time.perf_counter()
+        lock = self._reply_locks[interaction.id] = asyncio.Lock()
+        task = asyncio.ensure_future(handler(interaction, *args))
+        deferred = False
+        try:
+            done, _ = await asyncio.wait({task}, timeout=INTERACTION_DEFER_AFTER)
+            if not done:
+                async with lock:
+                    if interaction.id not in self._acknowledged:
+                        await interaction.response.defer(thinking=True)
+                        self._acknowledged.add(interaction.id)
+                        self._placeholders.add(interaction.id)
+                        deferred = True
+            await task
+        except Exception as e:
+            logger.error("Error in %s command: %s", handler.__name__, e)
+            await self.reply(interaction, error, ephemeral=True)
+        finally:
+            if not task.done():
+                task.cancel()
+            del self._reply_locks[interaction.id]
+            self._acknowledged.discard(interaction.id)
+            self._placeholders.discard(interaction.id)
+            if deferred:
+                logger.info("Deferred %s, completed in %.2fs", handler.__name__, time.perf_counter() - started)
     
-    async def charter(self, interaction: discord.Interaction, article: int):
-        """Retrieve UN Charter article by number"""
-        if await self.handle_rate_limit(interaction, 'charter'):
-            return
-        
-        if not validate_article_number(article):
-            await interaction.response.send_message("❌ Invalid article number. Please use a number between 1 and 999.", ephemeral=True)
+    async def reply(self, interaction: discord.Interaction, content: Optional[str] = None, **kwargs: Any) -> None:
+        """Send a response, or a followup once the interaction was deferred or answered"""
+        lock = self._reply_locks.get(interaction.id)
+        if lock is None:
+            await interaction.response.send_message(content, **kwargs)
             return
         
-        article_data = self.data.get_charter_article(article)
-        if not article_data:
-            available = self.data.get_available_articles()
-            await interaction.response.send_message(
-                f"❌ Article {article} not found. Available articles: {', '.join(map(str, available))}",
-                ephemeral=True
-            )
-            return
+        async with lock:
+            if interaction.id in self._acknowledged:
+                if interaction.id in self._placeholders:
+                    self._placeholders.discard(interaction.id)
+                    # The first followup replaces the "thinking" placeholder and keeps its public
+                    # visibility, so an ephemeral reply is sent only once the placeholder is gone
+                    if kwargs.get('ephemeral'):
+                        await interaction.delete_original_response()
+                await interaction.followup.send(content, **kwargs)
+            else:
+                await interaction.response.send_message(content, **kwargs)
+                self._acknowledged.add(interaction.id)
+    
+    def render_embed(self, command: str, key: str, builder: Callable[[], discord.Embed]) -> discord.Embed:
+        """Get a prebuilt embed from the render cache, building it on a miss"""
+        version = self.data.version
+        if version != self._embed_cache_version:
+            self._embed_cache.clear()
+            self._embed_cache_version = version
         
+        cache_key = (command, key, version)
+        entry = self._embed_cache.get(cache_key)
+        if entry is None:
+            entry = self._embed_cache[cache_key] = embed_entry(builder())
+        return clone_embed(*entry)
+    
+    def warm_embed_cache(self) -> int:
+        """Prebuild embeds for every charter article and policy term, returns the number cached"""
+        for article_num, article_data in self.data.charter_data.items():
+            self.render_embed('charter', article_num,
+                              lambda: self._build_charter_embed(int(article_num), article_data))
+        for key, policy_info in self.data.policy_data.items():
+            self.render_embed('policy', key, lambda: self._build_policy_embed(key, policy_info))
+        return len(self._embed_cache)
+    
+    def _build_charter_embed(self, article: int, article_data: Dict[str, Any]) -> discord.Embed:
+        """Build the /charter embed for an article"""
         embed = create_embed(
             title=f"UN Charter Article {article}",
             description=article_data.get('title', 'No title available'),
@@ -65,8 +169,83 @@ class UNBotCommands:
             embed.add_field(name="Content", value=content, inline=False)
         
         embed.set_footer(text="United Nations Charter • Use /help for more commands")
-        await interaction.response.send_message(embed=embed)
-        logger.info(f"Charter article {article} requested by {interaction.user.name}")
+        return embed
+    
+    def _build_policy_embed(self, key: str, policy_info: Dict[str, Any]) -> discord.Embed:
+        """Build the /policy embed for a policy term"""
+        embed = create_embed(
+            title=policy_info.get('title', key.title()),
+            description=policy_info.get('description', 'No description available'),
+            color=COLORS['success']
+        )
+        
+        if 'sources' in policy_info:
+            sources_text = "\n".join(policy_info['sources'][:3])
+            embed.add_field(name="Sources", value=sources_text, inline=False)
+        
+        if 'related_terms' in policy_info:
+            related_text = ", ".join(policy_info['related_terms'][:5])
+            embed.add_field(name="Related Terms", value=related_text, inline=False)
+        
+        embed.set_footer(text="United Nations Policy Definitions • Use /help for more commands")
+        return embed
+    
+    async def policy_autocomplete(self, interaction: discord.Interaction,
+                                  current: str) -> List[discord.app_commands.Choice[str]]:
+        """Suggest policy terms matching what has been typed so far"""
+        return [
+            discord.app_commands.Choice(name=label[:AUTOCOMPLETE_NAME_LIMIT], value=key)
+            for label, key in self.data.complete_policy_terms(current, AUTOCOMPLETE_LIMIT)
+        ]
+    
+    async def charter_autocomplete(self, interaction: discord.Interaction,
+                                   current: str) -> List[discord.app_commands.Choice[int]]:
+        """Suggest charter articles by number or title"""
+        return [
+            discord.app_commands.Choice(name=label[:AUTOCOMPLETE_NAME_LIMIT], value=article)
+            for label, article in self.data.complete_charter_articles(current, AUTOCOMPLETE_LIMIT)
+        ]
+    
+    async def search_autocomplete(self, interaction: discord.Interaction,
+                                  current: str) -> List[discord.app_commands.Choice[str]]:
+        """Suggest search topics from charter and policy titles"""
+        return [
+            discord.app_commands.Choice(name=label[:AUTOCOMPLETE_NAME_LIMIT], value=topic[:AUTOCOMPLETE_NAME_LIMIT])
+            for label, topic in self.data.complete_search_queries(current, AUTOCOMPLETE_LIMIT)
+        ]
+    
+    async def handle_rate_limit(self, interaction: discord.Interaction, command: str) -> bool:
+        """Handle rate limiting for commands"""
+        is_limited, remaining = await self.rate_limiter.is_rate_limited_async(
+            interaction.user.id, command, interaction.guild_id
+        )
+        if is_limited:
+            await self.reply(interaction, f"⏳ Please wait {remaining:.1f} seconds before using this command again.", ephemeral=True)
+            return True
+        return False
+    
+    async def charter(self, interaction: discord.Interaction, article: int):
+        """Retrieve UN Charter article by number"""
+        if await self.handle_rate_limit(interaction, 'charter'):
+            return
+        
+        if not validate_article_number(article):
+            await self.reply(interaction, "❌ Invalid article number. Please use a number between 1 and 999.", ephemeral=True)
+            return
+        
+        article_data = self.data.get_charter_article(article)
+        if not article_data:
+            available = self.data.get_available_articles()
+            await self.reply(
+                interaction,
+                f"❌ Article {article} not found. Available articles: {', '.join(map(str, available))}",
+                ephemeral=True
+            )
+            return
+        
+        embed = self.render_embed('charter', str(article), lambda: self._build_charter_embed(article, article_data))
+        await self.reply(interaction, embed=embed)
+        logger.info("Charter article %s requested by %s", article, interaction.user.name)
     
     async def resolution(self, interaction: discord.Interaction, resolution_type: str, number: int):
         """Search for UN resolutions"""
@@ -74,11 +253,11 @@ class UNBotCommands:
             return
         
         if not validate_resolution_type(resolution_type):
-            await interaction.response.send_message("❌ Invalid resolution type. Use 'sc' for Security Council or 'ga' for General Assembly.", ephemeral=True)
+            await self.reply(interaction, "❌ Invalid resolution type. Use 'sc' for Security Council or 'ga' for General Assembly.", ephemeral=True)
             return
         
         if not validate_resolution_number(number):
-            await interaction.response.send_message("❌ Invalid resolution number. Please use a number between 1 and 9999.", ephemeral=True)
+            await self.reply(interaction, "❌ Invalid resolution number. Please use a number between 1 and 9999.", ephemeral=True)
             return
         
         if resolution_type.lower() == 'sc':
@@ -88,13 +267,17 @@ class UNBotCommands:
             title = f"UN General Assembly Resolution {number}"
             un_url = f"https://www.un.org/en/ga/{number}"
         
+        record = await self.lookup_resolution(resolution_type, number)
         embed = create_embed(
             title=title,
-            description=f"Searching for {resolution_type.upper()} resolution {number}",
+            description=record['title'] if record else f"Searching for {resolution_type.upper()} resolution {number}",
             color=COLORS['success'],
-            url=un_url
+            url=record['url'] if record else un_url
         )
         
+        if record and record.get('date'):
+            embed.add_field(name="Adopted", value=record['date'], inline=True)
+        
         embed.add_field(
             name="Official UN Sources",
             value=f"[UN Official Website]({un_url})\n[UN Digital Library](https://digitallibrary.un.org/search?ln=en&p=resolution+{number})\n[UN Documentation](https://www.un.org/en/documents/)",
@@ -108,8 +291,21 @@ class UNBotCommands:
         )
         
         embed.set_footer(text="United Nations Official Documentation • Use /help for more commands")
-        await interaction.response.send_message(embed=embed)
-        logger.info(f"Resolution {resolution_type.upper()} {number} requested by {interaction.user.name}")
+        await self.reply(interaction, embed=embed)
+        logger.info("Resolution %s %s requested by %s", resolution_type.upper(), number, interaction.user.name)
+    
+    async def lookup_resolution(self, resolution_type: str, number: int) -> Optional[Dict]:
+        """Find a resolution in the local catalog, searching online and saving it on a miss"""
+        if self.catalog is None:
+            return None
+        
+        record = await self.catalog.get_async(resolution_type, number)
+        if record is None and self.scraper is not None and RESOLUTION_FETCH_ON_MISS:
+            record = await self.scraper.search_resolution(resolution_type, number)
+            # The search match is loose, only a record carrying the exact symbol becomes the catalog row
+            if record and matches_resolution(record['title'], resolution_type, number):
+                await self.catalog.add_many_async([record])
+        return record
     
     async def policy(self, interaction: discord.Interaction, term: str):
         """Get UN policy definition"""
@@ -118,36 +314,33 @@ class UNBotCommands:
         
         term = sanitize_input(term, 50)
         if not term:
-            await interaction.response.send_message("❌ Please provide a valid policy term.", ephemeral=True)
+            await self.reply(interaction, "❌ Please provide a valid policy term.", ephemeral=True)
             return
         
         policy_info = self.data.get_policy_term(term)
         if not policy_info:
+            suggestions = self.data.suggest_policy_terms(term)
+            if suggestions:
+                await self.reply(
+                    interaction,
+                    f"❌ Policy term '{term}' not found. Did you mean: {', '.join(suggestions)}?",
+                    ephemeral=True
+                )
+                return
+            
             available = self.data.get_available_terms()
-            await interaction.response.send_message(
+            await self.reply(
+                interaction,
                 f"❌ Policy term '{term}' not found. Available terms: {', '.join(available[:10])}" +
                 (f" and {len(available)-10} more..." if len(available) > 10 else ""),
                 ephemeral=True
             )
             return
         
-        embed = create_embed(
-            title=policy_info.get('title', term.title()),
-            description=policy_info.get('description', 'No description available'),
-            color=COLORS['success']
-        )
-        
-        if 'sources' in policy_info:
-            sources_text = "\n".join(policy_info['sources'][:3])
-            embed.add_field(name="Sources", value=sources_text, inline=False)
-        
-        if 'related_terms' in policy_info:
-            related_text = ", ".join(policy_info['related_terms'][:5])
-            embed.add_field(name="Related Terms", value=related_text, inline=False)
-        
-        embed.set_footer(text="United Nations Policy Definitions • Use /help for more commands")
-        await interaction.response.send_message(embed=embed)
-        logger.info(f"Policy term '{term}' requested by {interaction.user.name}")
+        key = self.data.resolve_policy_key(term)
+        embed = self.render_embed('policy', key, lambda: self._build_policy_embed(key, policy_info))
+        await self.reply(interaction, embed=embed)
+        logger.info("Policy term '%s' requested by %s", term, interaction.user.name)
     
     async def search(self, interaction: discord.Interaction, query: str):
         """Search for UN Charter articles or policy terms"""
@@ -156,30 +349,34 @@ class UNBotCommands:
         
         query = sanitize_input(query, 100)
         if not query:
-            await interaction.response.send_message("❌ Please provide a valid search query.", ephemeral=True)
+            await self.reply(interaction, "❌ Please provide a valid search query.", ephemeral=True)
             return
         
-        charter_results = self.data.search_charter(query)
-        policy_results = self.data.search_policy(query)
-        all_results = charter_results + policy_results
+        total, top_results = self.data.search(query, limit=5)
         
-        if not all_results:
+        if not top_results:
+            suggestions = [f"/policy {key}" for key in self.data.suggest_policy_terms(query)]
+            suggestions += [f"/charter {num}" for num in self.data.suggest_charter_articles(query)]
+            description = f"No results found for '{query}'"
+            if suggestions:
+                description += f"\n\nDid you mean: {', '.join(suggestions)}?"
+            
             embed = create_embed(
                 title="🔍 Search Results",
-                description=f"No results found for '{query}'",
+                description=description,
                 color=COLORS['warning'],
                 footer="Try different keywords or check available terms with /help"
             )
-            await interaction.response.send_message(embed=embed)
+            await self.reply(interaction, embed=embed)
             return
         
         embed = create_embed(
             title=f"🔍 Search Results for '{query}'",
-            description=f"Found {len(all_results)} result(s)",
+            description=f"Found {total} result(s)",
             color=COLORS['success']
         )
         
-        for result in all_results[:5]:  # Limit to 5 results
+        for result in top_results:  # Best 5 matches by relevance
             if result['type'] == 'Charter Article':
                 embed.add_field(
                     name=f"📜 {result['type']} {result['number']}: {result['title']}",
@@ -193,16 +390,16 @@ class UNBotCommands:
                     inline=False
                 )
         
-        if len(all_results) > 5:
+        if total > len(top_results):
             embed.add_field(
                 name="ℹ️ Note",
-                value=f"Showing first 5 of {len(all_results)} results. Try more specific search terms.",
+                value=f"Showing top {len(top_results)} of {total} results. Try more specific search terms.",
                 inline=False
             )
         
         embed.set_footer(text="Use /charter, /policy, or /resolution for specific items • Use /help for more commands")
-        await interaction.response.send_message(embed=embed)
-        logger.info(f"Search query '{query}' by {interaction.user.name} - {len(all_results)} results")
+        await self.reply(interaction, embed=embed)
+        logger.info("Search query '%s' by %s - %s results", query, interaction.user.name, total)
     
     async def latest(self, interaction: discord.Interaction):
         """Get latest UN news and updates"""
@@ -215,6 +412,29 @@ class UNBotCommands:
             color=COLORS['success']
         )
         
+        updated_at = None
+        if self.feeds is not None:
+            # Prefetched snapshot, never touches the network on the interaction path
+            snapshot = self.feeds.snapshot
+            items, missing, updated_at = snapshot.items, snapshot.missing, snapshot.updated_at
+        elif self.scraper is not None:
+            items, missing = await self.scraper.get_latest_updates(limit=5)
+        else:
+            items, missing = [], []
+        
+        if items:
+            lines = [f"• [{item['title'][:80]}]({item['url']}) — {item['source']}" for item in items]
+            if updated_at is not None:
+                lines.append(f"Updated <t:{int(updated_at)}:R>")
+            value = ""
+            for line in lines:
+                if len(value) + len(line) + 1 > EMBED_FIELD_LIMIT:
+                    break
+                value += line + "\n"
+            embed.add_field(name="Live Updates", value=value, inline=False)
+        if missing:
+            logger.info("Latest updates missing sources: %s", ', '.join(missing))
+        
         embed.add_field(
             name="Official UN News Sources",
             value="[UN News](https://news.un.org/)\n[UN Press Releases](https://press.un.org/)\n[Security Council Meetings](https://www.un.org/securitycouncil/content/meetings)",
@@ -234,8 +454,19 @@ class UNBotCommands:
         )
         
         embed.set_footer(text="United Nations Official Information • Use /help for more commands")
-        await interaction.response.send_message(embed=embed)
-        logger.info(f"Latest news requested by {interaction.user.name}")
+        await self.reply(interaction, embed=embed)
+        logger.info("Latest news requested by %s", interaction.user.name)
+    
+    async def reload_data(self, interaction: discord.Interaction):
+        """Reload the charter and policy data files without restarting"""
+        await self.data.reload_async()
+        await self.reply(
+            interaction,
+            f"✅ Reloaded {len(self.data.charter_data)} charter articles and "
+            f"{len(self.data.policy_data)} policy terms (version {self.data.version})",
+            ephemeral=True
+        )
+        logger.info("Data reload requested by %s", interaction.user.name)
     
     async def help_command(self, interaction: discord.Interaction):
         """Show help information"""
@@ -275,5 +506,5 @@ class UNBotCommands:
             ],
             footer="Built for informed civic engagement and policy understanding • Rate limits apply"
         )
-        await interaction.response.send_message(embed=embed)
-        logger.info(f"Help requested by {interaction.user.name}")
+        await self.reply(interaction, embed=embed)
+        logger.info("Help requested by %s", interaction.user.name)
@@ -8,10 +8,44 @@ load_dotenv()
 BOT_TOKEN = os.getenv('DISCORD_TOKEN')
 DEBUG = os.getenv('DEBUG', 'false').lower() == 'true'
 
+# Sharding: 'single' runs one gateway connection, 'auto' runs AutoShardedBot
+SHARD_MODE = os.getenv('SHARD_MODE', 'single').lower()
+# Total shards across all processes, unset to use Discord's recommendation
+SHARD_COUNT = int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None
+# Shards run by this process, e.g. '0-3' or '0,2', unset for all of them (set by launcher.py)
+SHARD_IDS = os.getenv('SHARD_IDS')
+# Seconds between per-shard health reports, and where to write them (unset to only log)
+HEALTH_REPORT_INTERVAL = float(os.getenv('HEALTH_REPORT_INTERVAL', '60'))
+HEALTH_DIR = os.getenv('HEALTH_DIR')
+
+# Logging: size-based rotation of LOG_FILE (unset LOG_FILE to log to the console only)
+LOG_FILE = os.getenv('LOG_FILE', 'bot.log')
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+# Keep 1 in N INFO lines per message for these high-volume loggers
+LOG_SAMPLE_RATES = {
+    'src.commands': int(os.getenv('LOG_COMMAND_SAMPLE_RATE', '10'))
+}
+
 # Data Paths
 DATA_DIR = 'data'
 CHARTER_FILE = f'{DATA_DIR}/un_charter.json'
 POLICY_FILE = f'{DATA_DIR}/policy_definitions.json'
+# Charter articles ingested from un.org, same shape as CHARTER_FILE
+CHARTER_ONLINE_FILE = f'{DATA_DIR}/un_charter_online.json'
+# Resolutions ingested from un.org listings, keyed by (body, number)
+RESOLUTION_CATALOG_FILE = os.getenv('RESOLUTION_CATALOG_FILE', f'{DATA_DIR}/resolutions.db')
+# Search the UN Digital Library when a resolution is not in the catalog, saving what it finds
+RESOLUTION_FETCH_ON_MISS = os.getenv('RESOLUTION_FETCH_ON_MISS', 'true').lower() == 'true'
+# Hash of the last synced slash command definitions, so unchanged trees are not re-synced
+COMMAND_SYNC_FILE = f'{DATA_DIR}/command_sync.json'
+# Sync commands to this guild only during development, where they update instantly
+DEV_GUILD_ID = int(os.getenv('DEV_GUILD_ID')) if os.getenv('DEV_GUILD_ID') else None
+# Seconds between checks of the data files for changes, which are then reloaded in the background
+DATA_WATCH_INTERVAL = float(os.getenv('DATA_WATCH_INTERVAL', '10'))
+
+# Search ('index' for token lookups, 'substring' for the legacy full scan)
+SEARCH_MODE = os.getenv('SEARCH_MODE', 'index').lower()
 
 # Rate Limiting (seconds)
 RATE_LIMITS = {
@@ -23,11 +57,101 @@ RATE_LIMITS = {
     'help': 1
 }
 
+# Additional rate-limit policies keyed by (scope, command)
+# scope is 'user', 'guild' or 'global'; command '*' applies across all commands
+# A ('user', command) policy replaces the fixed cooldown from RATE_LIMITS for that command
+RATE_LIMIT_POLICIES = {
+    # Let users look up a few articles in a row, refilling one every 5 seconds
+    ('user', 'charter'): {'type': 'token_bucket', 'rate': 0.2, 'capacity': 3},
+    ('guild', '*'): {'type': 'sliding_window', 'limit': 30, 'window': 10},
+    ('global', '*'): {'type': 'token_bucket', 'rate': 50, 'capacity': 100}
+}
+
+# Upper bound on tracked rate-limit entries, oldest are evicted first
+RATE_LIMIT_MAX_ENTRIES = int(os.getenv('RATE_LIMIT_MAX_ENTRIES', '100000'))
+
+# Where rate-limit state lives: 'memory' (per process), 'sqlite:///path.db' (shared per host)
+# or 'redis://host:port/db' (shared across hosts)
+RATE_LIMIT_STORE = os.getenv('RATE_LIMIT_STORE', 'memory')
+# Most checks against a shared store sent together: checks arriving while a batch is in
+# flight wait for it and go out as the next batch, in one round trip or transaction
+RATE_LIMIT_BATCH_SIZE = int(os.getenv('RATE_LIMIT_BATCH_SIZE', '64'))
+
+# UN website scraper HTTP pool
+# Upper bound for a request; once enough latencies are observed the timeout adapts
+# to p95 x SCRAPER_TIMEOUT_P95_MULTIPLIER, but never below SCRAPER_MIN_TIMEOUT
+SCRAPER_TIMEOUT = float(os.getenv('SCRAPER_TIMEOUT', '30'))
+SCRAPER_MIN_TIMEOUT = float(os.getenv('SCRAPER_MIN_TIMEOUT', '2'))
+SCRAPER_TIMEOUT_P95_MULTIPLIER = 2.0
+SCRAPER_CONNECTION_LIMIT = int(os.getenv('SCRAPER_CONNECTION_LIMIT', '20'))
+SCRAPER_CONNECTIONS_PER_HOST = int(os.getenv('SCRAPER_CONNECTIONS_PER_HOST', '4'))
+SCRAPER_KEEPALIVE_TIMEOUT = float(os.getenv('SCRAPER_KEEPALIVE_TIMEOUT', '60'))
+SCRAPER_DNS_CACHE_TTL = int(os.getenv('SCRAPER_DNS_CACHE_TTL', '300'))
+
+# Per-host circuit breaker: open after this many consecutive failures, probe again after the reset (seconds)
+SCRAPER_BREAKER_FAILURES = int(os.getenv('SCRAPER_BREAKER_FAILURES', '5'))
+SCRAPER_BREAKER_RESET = float(os.getenv('SCRAPER_BREAKER_RESET', '30'))
+# Retries allowed per request made, and per request at most
+SCRAPER_RETRY_RATIO = 0.2
+SCRAPER_MAX_RETRIES = 2
+
+# Response cache freshness per source (seconds) before a conditional revalidation
+SCRAPER_CACHE_TTLS = {
+    'news': 300,
+    'press': 300,
+    'security_council': 300,
+    'general_assembly': 900,
+    'charter': 86400,
+    'resolutions': 86400,
+    'digital_library': 3600
+}
+SCRAPER_CACHE_MAX_ENTRIES = int(os.getenv('SCRAPER_CACHE_MAX_ENTRIES', '256'))
+
+# HTML parsing runs off the event loop on a 'thread' or 'process' pool
+SCRAPER_PARSE_EXECUTOR = os.getenv('SCRAPER_PARSE_EXECUTOR', 'thread').lower()
+SCRAPER_PARSE_WORKERS = int(os.getenv('SCRAPER_PARSE_WORKERS', '2'))
+# Maximum parse jobs handed to the pool at once, further requests wait their turn
+SCRAPER_PARSE_QUEUE_SIZE = int(os.getenv('SCRAPER_PARSE_QUEUE_SIZE', '8'))
+
+# Extract news and Security Council links while the page downloads, stopping early
+SCRAPER_STREAMING = os.getenv('SCRAPER_STREAMING', 'true').lower() == 'true'
+SCRAPER_STREAM_CHUNK_SIZE = int(os.getenv('SCRAPER_STREAM_CHUNK_SIZE', '16384'))
+
+# /latest fans out to every source at once; a source missing its deadline (seconds) is skipped
+SCRAPER_AGGREGATE_CONCURRENCY = int(os.getenv('SCRAPER_AGGREGATE_CONCURRENCY', '5'))
+SCRAPER_SOURCE_DEADLINES = {
+    'news': 2.0,
+    'press': 2.0,
+    'security_council': 2.0,
+    'general_assembly': 2.0,
+    'digital_library': 2.0
+}
+
+# Background feed prefetch served by /latest
+FEED_SOURCES = ['news', 'security_council', 'press']
+FEED_ITEM_LIMIT = 5
+FEED_REFRESH_INTERVAL = float(os.getenv('FEED_REFRESH_INTERVAL', '300'))
+# Fraction of each delay randomized so several processes do not refresh in lockstep
+FEED_REFRESH_JITTER = 0.1
+# First retry delay after a failed refresh, doubled per consecutive failure up to the cap
+FEED_RETRY_BASE = 15.0
+FEED_MAX_BACKOFF = 1800.0
+# Per-source deadline (seconds) for background refreshes. Nobody waits on them, so a slow
+# source gets far longer than the interactive SCRAPER_SOURCE_DEADLINES before it is skipped
+FEED_SOURCE_DEADLINE = float(os.getenv('FEED_SOURCE_DEADLINE', '20'))
+
+# Commands still running after this many seconds are deferred and answered with a followup,
+# keeping well inside Discord's 3 second acknowledgment window
+INTERACTION_DEFER_AFTER = float(os.getenv('INTERACTION_DEFER_AFTER', '2'))
+
 # Discord Limits
 EMBED_TITLE_LIMIT = 256
 EMBED_DESC_LIMIT = 4096
 EMBED_FIELD_LIMIT = 1024
 EMBED_FIELDS_LIMIT = 25
+# Autocomplete choices per response, and characters per choice name
+AUTOCOMPLETE_LIMIT = 25
+AUTOCOMPLETE_NAME_LIMIT = 100
 
 # Colors
 COLORS = {
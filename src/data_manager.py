@@ -1,94 +1,670 @@
 """Data management for UN Charter and Policy definitions"""
+import asyncio
+import bisect
+import heapq
 import json
 import logging
-from typing import Dict, Any, Optional
-from .config import CHARTER_FILE, POLICY_FILE
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Any, Optional, List, Iterable, NamedTuple, Tuple
+from .config import CHARTER_FILE, CHARTER_ONLINE_FILE, POLICY_FILE, SEARCH_MODE, DATA_WATCH_INTERVAL
 
 logger = logging.getLogger(__name__)
 
+TOKEN_PATTERN = re.compile(r'\w+')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]|_')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Field weights applied to term frequencies when building the search indexes
+CHARTER_FIELD_WEIGHTS = {'title': 3.0, 'content': 1.0}
+POLICY_FIELD_WEIGHTS = {'term': 3.0, 'title': 3.0, 'aliases': 2.0, 'description': 1.0}
+
+# BM25 tuning parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Minimum trigram (Dice) similarity for a "did you mean" suggestion
+FUZZY_THRESHOLD = 0.3
+# Entries per trigram scored before the main scan, and candidates per size bucket
+# verified one by one before switching to counting postings
+FUZZY_SEEDS = 32
+FUZZY_VERIFY_LIMIT = 64
+
+# Prefix index entries examined per completion, bounding latency for one-letter prefixes
+PREFIX_SCAN_LIMIT = 500
+
+# A search token with no postings of its own matches the indexed tokens it starts, so
+# partial words such as "defen" still find documents. Shorter tokens only match whole
+# tokens, and expansion stops after this many indexed tokens
+PARTIAL_TOKEN_MIN_LENGTH = 3
+PARTIAL_TOKEN_EXPANSION_LIMIT = 64
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def normalize_term(text: str) -> str:
+    """Casefold, strip punctuation and collapse whitespace for exact-match lookups"""
+    text = PUNCTUATION_PATTERN.sub('', text.casefold())
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+def trigrams(text: str) -> set:
+    """Return the padded character trigrams of a normalized string"""
+    padded = f"  {text} "
+    return {padded[i:i+3] for i in range(len(padded) - 2)}
+
+class InvertedIndex:
+    """Token-level inverted index with per-field weights"""
+    
+    def __init__(self, field_weights: Dict[str, float]):
+        self.field_weights = field_weights
+        # term -> {doc_key: weighted term frequency}
+        self.postings: Dict[str, Dict[str, float]] = {}
+        # doc_key -> insertion position, used to keep results in corpus order
+        self.doc_order: Dict[str, int] = {}
+        # doc_key -> weighted document length, used for BM25 normalization
+        self.doc_lengths: Dict[str, float] = {}
+        self.total_length = 0.0
+        # Sorted indexed tokens for partial-word lookups, see vocabulary()
+        self._vocabulary: Optional[List[str]] = None
+    
+    def add(self, doc_key: str, fields: Dict[str, str]) -> None:
+        """Index a document given its field texts"""
+        self.doc_order[doc_key] = len(self.doc_order)
+        length = 0.0
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for token in tokenize(text):
+                doc_postings = self.postings.setdefault(token, {})
+                doc_postings[doc_key] = doc_postings.get(doc_key, 0.0) + weight
+                length += weight
+        self.doc_lengths[doc_key] = length
+        self.total_length += length
+        self._vocabulary = None
+    
+    def vocabulary(self) -> List[str]:
+        """Indexed tokens in sorted order"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+    
+    def _partial_postings(self, token: str) -> Dict[str, float]:
+        """Merged postings of the indexed tokens starting with a partial word"""
+        if len(token) < PARTIAL_TOKEN_MIN_LENGTH:
+            return {}
+        
+        vocabulary = self.vocabulary()
+        merged: Dict[str, float] = {}
+        start = bisect.bisect_left(vocabulary, token)
+        for indexed in vocabulary[start:start + PARTIAL_TOKEN_EXPANSION_LIMIT]:
+            if not indexed.startswith(token):
+                break
+            for doc_key, weight in self.postings[indexed].items():
+                merged[doc_key] = merged.get(doc_key, 0.0) + weight
+        return merged
+    
+    def _match(self, tokens: Iterable[str]) -> Tuple[List[Dict[str, float]], set]:
+        """Intersect postings for the given tokens, returning (posting lists, matching keys)"""
+        # Intersect from the rarest term so the candidate set shrinks fastest
+        posting_lists = []
+        for token in tokens:
+            doc_postings = self.postings.get(token) or self._partial_postings(token)
+            if not doc_postings:
+                return [], set()
+            posting_lists.append(doc_postings)
+        if not posting_lists:
+            return [], set()
+        posting_lists.sort(key=len)
+        
+        matches = set(posting_lists[0])
+        for doc_postings in posting_lists[1:]:
+            matches.intersection_update(doc_postings)
+            if not matches:
+                break
+        
+        return posting_lists, matches
+    
+    def lookup(self, query: str) -> List[str]:
+        """Return keys of documents containing every query token (or a word it starts), in corpus order"""
+        _, matches = self._match(set(tokenize(query)))
+        return sorted(matches, key=self.doc_order.__getitem__)
+    
+    def rank(self, query: str, limit: int) -> Tuple[int, List[Tuple[str, float]]]:
+        """
+        Score documents containing every query token with BM25
+        Returns: (total_matches, [(doc_key, score), ...] for the top `limit` documents)
+        """
+        posting_lists, matches = self._match(set(tokenize(query)))
+        if not matches or limit <= 0:
+            return len(matches), []
+        
+        doc_count = len(self.doc_lengths)
+        avg_length = self.total_length / doc_count or 1.0
+        idfs = [
+            math.log(1 + (doc_count - len(doc_postings) + 0.5) / (len(doc_postings) + 0.5))
+            for doc_postings in posting_lists
+        ]
+        
+        def scored():
+            for doc_key in matches:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_key] / avg_length)
+                score = 0.0
+                for idf, doc_postings in zip(idfs, posting_lists):
+                    tf = doc_postings[doc_key]
+                    score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                yield score, -self.doc_order[doc_key], doc_key
+        
+        # Bounded heap selection: only `limit` entries are ever kept
+        top = heapq.nlargest(limit, scored())
+        return len(matches), [(doc_key, score) for score, _, doc_key in top]
+
+class TrigramIndex:
+    """
+    Character trigram index for fuzzy "did you mean" matching
+    Entries are bucketed by trigram count. A Dice score of at least t needs an entry size
+    within a band around the query's and at least ceil(t * (q + size) / 2) shared grams,
+    so each bucket only needs the postings of the query's rarest q - needed + 1 grams:
+    any entry reaching the threshold holds one of them. Buckets are visited best bound
+    first and the threshold rises to the current k-th best score, tightening both filters.
+    """
+    
+    def __init__(self):
+        # size -> trigram -> ids of entries of that size containing it
+        self.buckets: Dict[int, Dict[str, List[int]]] = {}
+        # trigram -> number of entries containing it, for rare-first scanning
+        self.frequency: Dict[str, int] = {}
+        # trigram -> first few entries containing it, scored up front to raise the threshold early
+        self.seeds: Dict[str, List[int]] = {}
+        self.values: List[str] = []
+        self.grams: List[Tuple[str, ...]] = []
+    
+    def add(self, text: str, value: str) -> None:
+        """Index a name that should resolve to the given value"""
+        normalized = normalize_term(text)
+        if not normalized:
+            return
+        
+        entry_id = len(self.values)
+        grams = trigrams(normalized)
+        postings = self.buckets.setdefault(len(grams), {})
+        self.values.append(value)
+        self.grams.append(tuple(grams))
+        for gram in grams:
+            postings.setdefault(gram, []).append(entry_id)
+            self.frequency[gram] = self.frequency.get(gram, 0) + 1
+            seeds = self.seeds.setdefault(gram, [])
+            if len(seeds) < FUZZY_SEEDS:
+                seeds.append(entry_id)
+    
+    def search(self, query: str, limit: int = 3, threshold: float = FUZZY_THRESHOLD) -> List[Tuple[str, float]]:
+        """Return up to `limit` (value, similarity) pairs, best first"""
+        normalized = normalize_term(query)
+        if not normalized:
+            return []
+        
+        query_grams = trigrams(normalized)
+        size = len(query_grams)
+        # Grams no entry contains can never be shared, only the rest count towards the overlap
+        grams = {gram for gram in query_grams if gram in self.frequency}
+        rare_first = sorted(grams, key=self.frequency.__getitem__)
+        
+        # Keep the best score per value, several names may map to one value
+        best: Dict[str, float] = {}
+        
+        def consider(entry_id: int, shared: int, entry_size: int) -> None:
+            score = 2 * shared / (size + entry_size)
+            value = self.values[entry_id]
+            if score >= threshold and score > best.get(value, 0.0):
+                best[value] = score
+        
+        def bound(entry_size: int) -> float:
+            """Best score possible against an entry of this size"""
+            return 2 * min(len(grams), entry_size) / (size + entry_size)
+        
+        for gram in rare_first[:2]:
+            for entry_id in self.seeds[gram]:
+                entry_grams = self.grams[entry_id]
+                consider(entry_id, len(grams.intersection(entry_grams)), len(entry_grams))
+        
+        for entry_size in sorted(self.buckets, key=bound, reverse=True):
+            floor = threshold
+            if len(best) >= limit:
+                floor = max(floor, heapq.nlargest(limit, best.values())[-1])
+            if bound(entry_size) < floor:
+                break
+            
+            needed = max(1, math.ceil(floor * (size + entry_size) / 2 - 1e-9))
+            if needed > len(grams):
+                continue
+            postings = self.buckets[entry_size]
+            candidates = set()
+            for gram in rare_first[:len(grams) - needed + 1]:
+                candidates.update(postings.get(gram, ()))
+            
+            if len(candidates) <= FUZZY_VERIFY_LIMIT:
+                for entry_id in candidates:
+                    consider(entry_id, len(grams.intersection(self.grams[entry_id])), entry_size)
+                continue
+            
+            # Many candidates: counting every query gram's postings is cheaper than verifying each
+            shared = Counter()
+            for gram in rare_first:
+                shared.update(postings.get(gram, ()))
+            for entry_id, count in shared.items():
+                if count >= needed:
+                    consider(entry_id, count, entry_size)
+        
+        return heapq.nlargest(limit, best.items(), key=lambda item: item[1])
+
+class PrefixIndex:
+    """
+    Sorted-array index completing names from a prefix of any of their words
+    Each name is stored once per word, so "prot" completes "Responsibility to Protect".
+    Matches on the first word rank ahead of matches later in the name.
+    """
+    
+    def __init__(self, entries: Iterable[Tuple[str, str, Any]]):
+        # (normalized name from a word onwards, word position, label, value), sorted
+        rows = []
+        for text, label, value in entries:
+            words = normalize_term(text).split(' ')
+            for position in range(len(words)):
+                suffix = ' '.join(words[position:])
+                if suffix:
+                    rows.append((suffix, position, label, value))
+        rows.sort(key=lambda row: row[:3])
+        self.keys = [row[0] for row in rows]
+        self.rows = rows
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def complete(self, prefix: str, limit: int) -> List[Tuple[str, Any]]:
+        """Return up to `limit` (label, value) pairs whose names have a word starting with `prefix`"""
+        prefix = normalize_term(prefix)
+        start = bisect.bisect_left(self.keys, prefix)
+        matches = []
+        for row in self.rows[start:start + PREFIX_SCAN_LIMIT]:
+            if not row[0].startswith(prefix):
+                break
+            matches.append(row)
+        
+        seen = set()
+        completions = []
+        for _, _, label, value in sorted(matches, key=lambda row: (row[1], row[2])):
+            if value not in seen:
+                seen.add(value)
+                completions.append((label, value))
+                if len(completions) == limit:
+                    break
+        return completions
+
+class DataSnapshot(NamedTuple):
+    """
+    Loaded data files and every index derived from them
+    Never modified after it is built: a reload builds a new snapshot and swaps it in whole.
+    """
+    charter_data: Dict[str, Any]
+    policy_data: Dict[str, Any]
+    # Full Charter ingested from un.org, fills in articles missing from charter_data
+    charter_online: Dict[str, Any]
+    charter_index: InvertedIndex
+    policy_index: InvertedIndex
+    # normalized term/alias/title -> canonical policy key
+    policy_aliases: Dict[str, str]
+    policy_fuzzy: TrigramIndex
+    charter_fuzzy: TrigramIndex
+    # Autocomplete indexes over policy names, charter article numbers/titles and search topics
+    policy_prefix: PrefixIndex
+    charter_prefix: PrefixIndex
+    search_prefix: PrefixIndex
+
+def build_charter_prefix(charter_data: Dict[str, Any], charter_online: Dict[str, Any]) -> PrefixIndex:
+    """Index article numbers and titles, including ingested articles, for autocomplete"""
+    articles = {**charter_online, **charter_data}
+    return PrefixIndex(
+        (name, f"Article {article_num}: {article_data.get('title', '')}", int(article_num))
+        for article_num, article_data in articles.items()
+        for name in [article_num, article_data.get('title', '')]
+    )
+
+def build_snapshot(charter_data: Dict[str, Any], policy_data: Dict[str, Any],
+                   charter_online: Dict[str, Any]) -> DataSnapshot:
+    """Build the search indexes from loaded data"""
+    charter_index = InvertedIndex(CHARTER_FIELD_WEIGHTS)
+    for article_num, article_data in charter_data.items():
+        charter_index.add(article_num, {
+            'title': article_data.get('title', ''),
+            'content': article_data.get('content', '')
+        })
+    
+    policy_index = InvertedIndex(POLICY_FIELD_WEIGHTS)
+    for term, term_data in policy_data.items():
+        policy_index.add(term, {
+            'term': term,
+            'title': term_data.get('title', ''),
+            'aliases': ' '.join(term_data.get('aliases', [])),
+            'description': term_data.get('description', '')
+        })
+    
+    # Sort the vocabularies here, off the event loop when reloading, not on the first search
+    charter_index.vocabulary()
+    policy_index.vocabulary()
+    
+    policy_aliases = {}
+    for term, term_data in policy_data.items():
+        for name in [term_data.get('title', '')] + term_data.get('aliases', []):
+            normalized = normalize_term(name)
+            if normalized:
+                policy_aliases.setdefault(normalized, term)
+    # Canonical keys take precedence over any alias that normalizes the same way
+    for term in policy_data:
+        policy_aliases[normalize_term(term)] = term
+    
+    policy_fuzzy = TrigramIndex()
+    for term, term_data in policy_data.items():
+        for name in [term, term_data.get('title', '')] + term_data.get('aliases', []):
+            policy_fuzzy.add(name, term)
+    
+    charter_fuzzy = TrigramIndex()
+    for article_num, article_data in charter_data.items():
+        charter_fuzzy.add(article_data.get('title', ''), article_num)
+    
+    policy_prefix = PrefixIndex(
+        (name, term_data.get('title', term), term)
+        for term, term_data in policy_data.items()
+        for name in [term, term_data.get('title', '')] + term_data.get('aliases', [])
+    )
+    
+    topics = {term_data.get('title', term) for term, term_data in policy_data.items()}
+    topics.update(article_data.get('title', '') for article_data in charter_data.values())
+    search_prefix = PrefixIndex((topic, topic, topic) for topic in topics if topic)
+    
+    logger.info("Indexed %s charter terms, %s policy terms",
+                len(charter_index.postings), len(policy_index.postings))
+    return DataSnapshot(
+        charter_data=charter_data,
+        policy_data=policy_data,
+        charter_online=charter_online,
+        charter_index=charter_index,
+        policy_index=policy_index,
+        policy_aliases=policy_aliases,
+        policy_fuzzy=policy_fuzzy,
+        charter_fuzzy=charter_fuzzy,
+        policy_prefix=policy_prefix,
+        charter_prefix=build_charter_prefix(charter_data, charter_online),
+        search_prefix=search_prefix
+    )
+
+def _snapshot_field(name: str) -> property:
+    """Read-only attribute served from the current snapshot"""
+    return property(lambda self: getattr(self.snapshot, name))
+
 class DataManager:
-    """Manages UN Charter and Policy data"""
+    """
+    Manages UN Charter and Policy data
+    All data and indexes live in one DataSnapshot. Reloads build the next snapshot off to
+    the side and replace the reference in a single assignment, so lookups always see
+    either the old or the new data, never a mix.
+    """
+    
+    charter_data = _snapshot_field('charter_data')
+    policy_data = _snapshot_field('policy_data')
+    charter_online = _snapshot_field('charter_online')
+    charter_index = _snapshot_field('charter_index')
+    policy_index = _snapshot_field('policy_index')
+    policy_aliases = _snapshot_field('policy_aliases')
+    policy_fuzzy = _snapshot_field('policy_fuzzy')
+    charter_fuzzy = _snapshot_field('charter_fuzzy')
+    policy_prefix = _snapshot_field('policy_prefix')
+    charter_prefix = _snapshot_field('charter_prefix')
+    search_prefix = _snapshot_field('search_prefix')
     
     def __init__(self):
-        self.charter_data: Dict[str, Any] = {}
-        self.policy_data: Dict[str, Any] = {}
+        # Incremented on every (re)load so caches of derived output can be invalidated
+        self.version = 0
+        # (path, mtime) of each data file as of the last load, for the file watcher
+        self.file_stamps: Tuple[Tuple[str, Optional[float]], ...] = ()
+        self.snapshot: DataSnapshot
         self._load_data()
     
     def _load_data(self) -> None:
         """Load all data files"""
-        self.charter_data = self._load_json(CHARTER_FILE)
-        self.policy_data = self._load_json(POLICY_FILE)
+        self._swap(*self._build())
     
-    def _load_json(self, filepath: str) -> Dict[str, Any]:
-        """Load JSON data with error handling"""
+    def _build(self, strict: bool = False) -> Tuple[DataSnapshot, Tuple[Tuple[str, Optional[float]], ...]]:
+        """
+        Parse the data files into a new snapshot, touching no shared state
+        With `strict`, an unreadable or invalid file raises instead of loading as empty,
+        so a reload that catches a half-saved file keeps serving the current snapshot.
+        """
+        stamps = self.data_file_stamps()
+        charter_data = self._load_json(CHARTER_FILE, strict)
+        policy_data = self._load_json(POLICY_FILE, strict)
+        charter_online = self._load_json(CHARTER_ONLINE_FILE, strict) if os.path.exists(CHARTER_ONLINE_FILE) else {}
+        return build_snapshot(charter_data, policy_data, charter_online), stamps
+    
+    def _swap(self, snapshot: DataSnapshot, stamps: Tuple[Tuple[str, Optional[float]], ...]) -> None:
+        """Publish a new snapshot"""
+        self.snapshot = snapshot
+        self.file_stamps = stamps
+        self.version += 1
+    
+    def reload(self) -> None:
+        """Reload data files and rebuild all derived indexes, keeping the current data if a file is invalid"""
+        self._swap(*self._build(strict=True))
+    
+    async def reload_async(self) -> None:
+        """Reload on a worker thread, swapping the result in on the event loop"""
+        loop = asyncio.get_running_loop()
+        self._swap(*await loop.run_in_executor(None, self._build, True))
+        logger.info("Reloaded data files (version %s)", self.version)
+    
+    @staticmethod
+    def data_file_stamps() -> Tuple[Tuple[str, Optional[float]], ...]:
+        """Modification times of the data files, None for a missing file"""
+        stamps = []
+        for path in (CHARTER_FILE, POLICY_FILE, CHARTER_ONLINE_FILE):
+            try:
+                stamps.append((path, os.stat(path).st_mtime))
+            except OSError:
+                stamps.append((path, None))
+        return tuple(stamps)
+    
+    async def watch(self, interval: float = DATA_WATCH_INTERVAL) -> None:
+        """
+        Poll the data files and reload whenever one of them changes
+        A reload that fails is retried only once a file changes again, so a file left
+        invalid is reported once rather than on every poll.
+        """
+        failed_stamps = None
+        while True:
+            await asyncio.sleep(interval)
+            stamps = self.data_file_stamps()
+            if stamps == self.file_stamps or stamps == failed_stamps:
+                continue
+            try:
+                await self.reload_async()
+                failed_stamps = None
+            except Exception as e:
+                logger.error("Error reloading data files, keeping the current data until they change: %s", e)
+                failed_stamps = stamps
+    
+    def _load_json(self, filepath: str, strict: bool = False) -> Dict[str, Any]:
+        """Load JSON data with error handling, re-raising errors when `strict`"""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                logger.info(f"Loaded {len(data)} items from {filepath}")
+                logger.info("Loaded %s items from %s", len(data), filepath)
                 return data
         except FileNotFoundError:
-            logger.error(f"Data file not found: {filepath}")
+            logger.error("Data file not found: %s", filepath)
+            if strict:
+                raise
             return {}
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in {filepath}: {e}")
+            logger.error("Invalid JSON in %s: %s", filepath, e)
+            if strict:
+                raise
             return {}
         except Exception as e:
-            logger.error(f"Error loading {filepath}: {e}")
+            logger.error("Error loading %s: %s", filepath, e)
+            if strict:
+                raise
             return {}
     
     def get_charter_article(self, article_num: int) -> Optional[Dict[str, Any]]:
         """Get charter article by number"""
-        return self.charter_data.get(str(article_num))
+        key = str(article_num)
+        return self.charter_data.get(key) or self.charter_online.get(key)
     
-    def get_policy_term(self, term: str) -> Optional[Dict[str, Any]]:
-        """Get policy term by name"""
-        term_lower = term.lower()
-        
-        # Direct match
-        if term_lower in self.policy_data:
-            return self.policy_data[term_lower]
+    def store_charter_online(self, articles: Dict[str, Any], path: str = CHARTER_ONLINE_FILE) -> None:
+        """Replace the ingested Charter and persist it in the same shape as the Charter data file"""
+        if not articles:
+            return
         
-        # Search in aliases
-        for key, value in self.policy_data.items():
-            if term_lower in value.get('aliases', []):
-                return value
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(articles, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
         
-        return None
+        # Copy-on-write: only the charter_online-derived parts of the snapshot change
+        self.snapshot = self.snapshot._replace(
+            charter_online=articles,
+            charter_prefix=build_charter_prefix(self.charter_data, articles)
+        )
+        # Our own write should not look like an outside change to the file watcher
+        self.file_stamps = tuple(
+            (stamp_path, os.stat(path).st_mtime if stamp_path == path else mtime)
+            for stamp_path, mtime in self.file_stamps
+        )
+        self.version += 1
+        logger.info("Stored %s ingested charter articles in %s", len(articles), path)
+    
+    def get_policy_term(self, term: str) -> Optional[Dict[str, Any]]:
+        """Get policy term by name"""
+        key = self.resolve_policy_key(term)
+        if key is None:
+            return None
+        return self.policy_data[key]
+    
+    def resolve_policy_key(self, term: str) -> Optional[str]:
+        """Get the canonical policy key for a term, alias or title"""
+        return self.policy_aliases.get(normalize_term(term))
+    
+    def suggest_policy_terms(self, term: str, limit: int = 3) -> List[str]:
+        """Get the closest policy keys to a term that did not match"""
+        return [key for key, _ in self.policy_fuzzy.search(term, limit)]
+    
+    def suggest_charter_articles(self, title: str, limit: int = 3) -> List[int]:
+        """Get the numbers of charter articles whose titles are closest to a query"""
+        return [int(num) for num, _ in self.charter_fuzzy.search(title, limit)]
+    
+    def complete_policy_terms(self, prefix: str, limit: int = 25) -> List[Tuple[str, str]]:
+        """Get (title, policy key) completions for a partially typed term"""
+        return self.policy_prefix.complete(prefix, limit)
+    
+    def complete_charter_articles(self, prefix: str, limit: int = 25) -> List[Tuple[str, int]]:
+        """Get (label, article number) completions for a partially typed number or title"""
+        return self.charter_prefix.complete(prefix, limit)
     
-    def search_charter(self, query: str) -> list:
-        """Search charter articles"""
+    def complete_search_queries(self, prefix: str, limit: int = 25) -> List[Tuple[str, str]]:
+        """Get (topic, topic) completions from policy and charter titles"""
+        return self.search_prefix.complete(prefix, limit)
+    
+    def _charter_result(self, article_num: str, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a search result entry for a charter article"""
+        return {
+            'type': 'Charter Article',
+            'number': article_num,
+            'title': article_data.get('title', 'No title'),
+            'preview': article_data.get('content', '')[:200] + '...'
+        }
+    
+    def _policy_result(self, term: str, term_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a search result entry for a policy term"""
+        return {
+            'type': 'Policy Term',
+            'term': term,
+            'title': term_data.get('title', 'No title'),
+            'preview': term_data.get('description', '')[:200] + '...'
+        }
+    
+    def _substring_charter_matches(self, query: str) -> Iterable[str]:
+        """Scan charter articles for a raw substring match"""
         query_lower = query.lower()
-        results = []
-        
         for article_num, article_data in self.charter_data.items():
-            if (query_lower in article_data.get('title', '').lower() or 
+            if (query_lower in article_data.get('title', '').lower() or
                 query_lower in article_data.get('content', '').lower()):
-                results.append({
-                    'type': 'Charter Article',
-                    'number': article_num,
-                    'title': article_data.get('title', 'No title'),
-                    'preview': article_data.get('content', '')[:200] + '...'
-                })
-        
-        return results
+                yield article_num
     
-    def search_policy(self, query: str) -> list:
-        """Search policy terms"""
+    def _substring_policy_matches(self, query: str) -> Iterable[str]:
+        """Scan policy terms for a raw substring match"""
         query_lower = query.lower()
-        results = []
-        
         for term, term_data in self.policy_data.items():
-            if (query_lower in term or 
+            if (query_lower in term or
                 query_lower in term_data.get('title', '').lower() or
                 query_lower in term_data.get('description', '').lower()):
-                results.append({
-                    'type': 'Policy Term',
-                    'term': term,
-                    'title': term_data.get('title', 'No title'),
-                    'preview': term_data.get('description', '')[:200] + '...'
-                })
-        
-        return results
+                yield term
+    
+    def search_charter(self, query: str, mode: str = SEARCH_MODE) -> list:
+        """
+        Search charter articles
+        mode: 'index' matches tokens via the inverted index, unknown tokens matching the
+              words they start (partial words such as "defen"), 'substring' scans every
+              article for a raw substring match
+        """
+        if mode == 'substring':
+            matches = self._substring_charter_matches(query)
+        else:
+            matches = self.charter_index.lookup(query)
+        
+        return [self._charter_result(num, self.charter_data[num]) for num in matches]
+    
+    def search_policy(self, query: str, mode: str = SEARCH_MODE) -> list:
+        """
+        Search policy terms
+        mode: 'index' matches tokens via the inverted index, unknown tokens matching the
+              words they start, 'substring' scans every term for a raw substring match
+        """
+        if mode == 'substring':
+            matches = self._substring_policy_matches(query)
+        else:
+            matches = self.policy_index.lookup(query)
+        
+        return [self._policy_result(term, self.policy_data[term]) for term in matches]
+    
+    def search(self, query: str, limit: int = 5, mode: str = SEARCH_MODE) -> Tuple[int, list]:
+        """
+        Search charter articles and policy terms together
+        Returns: (total_matches, up to `limit` results ordered by relevance score)
+        """
+        if mode == 'substring':
+            # No term statistics to score with, keep corpus order
+            matches = [('charter', num) for num in self._substring_charter_matches(query)]
+            matches += [('policy', term) for term in self._substring_policy_matches(query)]
+            ranked = [(source, key, 0.0) for source, key in matches[:limit]]
+            total = len(matches)
+        else:
+            charter_total, charter_top = self.charter_index.rank(query, limit)
+            policy_total, policy_top = self.policy_index.rank(query, limit)
+            candidates = [('charter', key, score) for key, score in charter_top]
+            candidates += [('policy', key, score) for key, score in policy_top]
+            ranked = heapq.nlargest(limit, candidates, key=lambda item: item[2])
+            total = charter_total + policy_total
+        
+        results = []
+        for source, key, score in ranked:
+            if source == 'charter':
+                result = self._charter_result(key, self.charter_data[key])
+            else:
+                result = self._policy_result(key, self.policy_data[key])
+            result['score'] = score
+            results.append(result)
+        
+        return total, results
     
     def get_available_articles(self) -> list:
         """Get list of available charter articles"""
@@ -0,0 +1,99 @@
+"""Background prefetch of UN feeds into an immutable snapshot"""
+import asyncio
+import logging
+import random
+import time
+from types import MappingProxyType
+from typing import List, NamedTuple, Optional, Tuple
+
+from .config import (
+    FEED_SOURCES, FEED_ITEM_LIMIT, FEED_REFRESH_INTERVAL, FEED_REFRESH_JITTER,
+    FEED_RETRY_BASE, FEED_MAX_BACKOFF, FEED_SOURCE_DEADLINE
+)
+from .un_scraper import UNScraper
+
+logger = logging.getLogger(__name__)
+
+class FeedSnapshot(NamedTuple):
+    """Immutable view of the latest feed items"""
+    items: Tuple[MappingProxyType, ...]
+    missing: Tuple[str, ...]
+    updated_at: Optional[float]
+
+EMPTY_SNAPSHOT = FeedSnapshot(items=(), missing=(), updated_at=None)
+
+class FeedScheduler:
+    """
+    Periodically refreshes UN feeds through UNScraper in the background
+    Readers get the last published snapshot in O(1) and never wait on the network.
+    Refreshes run every `interval` seconds with random jitter, backing off
+    exponentially (capped at `max_backoff`) while refreshes keep failing.
+    """
+    
+    def __init__(self, scraper: UNScraper, sources: Optional[List[str]] = None,
+                 interval: float = FEED_REFRESH_INTERVAL, jitter: float = FEED_REFRESH_JITTER,
+                 retry_base: float = FEED_RETRY_BASE, max_backoff: float = FEED_MAX_BACKOFF):
+        self.scraper = scraper
+        self.sources = sources or FEED_SOURCES
+        self.interval = interval
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.max_backoff = max_backoff
+        self.snapshot = EMPTY_SNAPSHOT
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the refresh loop, safe to call more than once"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='feed-scheduler')
+    
+    async def stop(self) -> None:
+        """Stop the refresh loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def refresh(self) -> bool:
+        """Fetch the feeds once and publish a new snapshot, returns whether it succeeded"""
+        try:
+            items, missing = await self.scraper.get_latest_updates(
+                limit=FEED_ITEM_LIMIT, sources=self.sources,
+                deadlines={source: FEED_SOURCE_DEADLINE for source in self.sources}
+            )
+        except Exception as e:
+            logger.error("Feed refresh failed: %s", e)
+            return False
+        
+        if not items:
+            logger.warning("Feed refresh returned no items (missing: %s)", ', '.join(missing))
+            return False
+        
+        # Publish by swapping a single reference, readers never see a partial update
+        self.snapshot = FeedSnapshot(
+            items=tuple(MappingProxyType(dict(item)) for item in items),
+            missing=tuple(missing),
+            updated_at=time.time()
+        )
+        return True
+    
+    def next_delay(self) -> float:
+        """Seconds until the next refresh, given the current failure streak"""
+        if self.failures:
+            delay = min(self.max_backoff, self.retry_base * 2 ** (self.failures - 1))
+        else:
+            delay = self.interval
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+    
+    async def _run(self) -> None:
+        """Refresh loop"""
+        while True:
+            if await self.refresh():
+                self.failures = 0
+            else:
+                self.failures += 1
+            await asyncio.sleep(self.next_delay())
@@ -0,0 +1,71 @@
+"""Non-blocking logging: records are queued and written by a background thread"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+from .config import LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_SAMPLE_RATES
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep 1 in N INFO-and-below records per message template for high-volume loggers
+    With %-style calls the template is the unformatted msg, so every "requested by"
+    line shares one counter however its arguments vary. Warnings and errors always pass.
+    """
+    
+    def __init__(self, rates: Dict[str, int]):
+        super().__init__()
+        self.rates = rates
+        self.counts: Dict[Tuple[str, str], int] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rates.get(record.name, 1)
+        if rate <= 1:
+            return True
+        
+        key = (record.name, str(record.msg))
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        return count % rate == 0
+
+def setup_logging(level: int = logging.INFO, path: Optional[str] = LOG_FILE,
+                  max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT,
+                  sample_rates: Dict[str, int] = LOG_SAMPLE_RATES) -> QueueListener:
+    """
+    Route all logging through a queue drained by a listener thread
+    Callers only pay for enqueueing a record; formatting the output, writing and
+    rotating `path` (at `max_bytes`, keeping `backup_count` old files) and console
+    output all happen on the listener thread.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if path:
+        handlers.append(RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                            encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rates))
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+def stop_logging(listener: QueueListener) -> None:
+    """Flush whatever is still queued and stop the listener thread, safe to call twice"""
+    if listener._thread is not None:
+        listener.stop()
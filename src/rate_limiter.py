@@ -1,46 +1,652 @@
 """Rate limiting for Discord bot commands"""
+import asyncio
+import hashlib
+import json
+import logging
+import socket
+import sqlite3
 import time
-from typing import Dict, Tuple
-from .config import RATE_LIMITS
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from .config import (
+    RATE_LIMITS, RATE_LIMIT_MAX_ENTRIES, RATE_LIMIT_POLICIES, RATE_LIMIT_STORE, RATE_LIMIT_BATCH_SIZE
+)
 
-class RateLimiter:
-    """Simple rate limiter for bot commands"""
+logger = logging.getLogger(__name__)
+
+class RateLimitPolicy:
+    """
+    Base class for rate-limit policies
+    Policies hold no per-key state: evaluate() maps the stored state of a key to a decision
+    """
+    
+    def evaluate(self, state: Any, now: float) -> Tuple[bool, float, Any, float]:
+        """
+        Decide whether a hit is allowed
+        Returns: (allowed, retry_after, new_state, ttl) where ttl is how long new_state matters
+        """
+        raise NotImplementedError
+    
+    def script_args(self) -> Optional[Tuple[str, float, float]]:
+        """(type, first parameter, second parameter) for RATE_LIMIT_SCRIPT, None if it has no server-side form"""
+        return None
+
+class CooldownPolicy(RateLimitPolicy):
+    """Fixed cooldown between uses, state is the expiry time"""
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+    
+    def script_args(self) -> Optional[Tuple[str, float, float]]:
+        return 'cooldown', self.seconds, 0
+    
+    def evaluate(self, state: Any, now: float) -> Tuple[bool, float, Any, float]:
+        if state is not None and state > now:
+            return False, state - now, state, state - now
+        return True, 0.0, now + self.seconds, self.seconds
+
+class TokenBucketPolicy(RateLimitPolicy):
+    """Token bucket allowing bursts of `capacity` refilled at `rate` tokens per second"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+    
+    def script_args(self) -> Optional[Tuple[str, float, float]]:
+        return 'token_bucket', self.rate, self.capacity
+    
+    def evaluate(self, state: Any, now: float) -> Tuple[bool, float, Any, float]:
+        if state is None:
+            tokens = self.capacity
+        else:
+            tokens, updated = state
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        
+        if tokens >= 1:
+            tokens -= 1
+            return True, 0.0, (tokens, now), (self.capacity - tokens) / self.rate
+        return False, (1 - tokens) / self.rate, (tokens, now), (self.capacity - tokens) / self.rate
+
+class SlidingWindowPolicy(RateLimitPolicy):
+    """Sliding window log allowing `limit` hits in any `window` seconds"""
+    
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+    
+    def script_args(self) -> Optional[Tuple[str, float, float]]:
+        return 'sliding_window', self.limit, self.window
+    
+    def evaluate(self, state: Any, now: float) -> Tuple[bool, float, Any, float]:
+        cutoff = now - self.window
+        hits = [t for t in (state or ()) if t > cutoff]
+        
+        if len(hits) < self.limit:
+            hits.append(now)
+            return True, 0.0, hits, self.window
+        return False, hits[0] - cutoff, hits, hits[-1] - cutoff
+
+POLICY_TYPES = {
+    'cooldown': CooldownPolicy,
+    'token_bucket': TokenBucketPolicy,
+    'sliding_window': SlidingWindowPolicy
+}
+
+def build_policy(spec: Dict[str, Any]) -> RateLimitPolicy:
+    """Create a policy from a config spec such as {'type': 'token_bucket', 'rate': 1, 'capacity': 3}"""
+    params = dict(spec)
+    policy_type = params.pop('type')
+    if policy_type not in POLICY_TYPES:
+        raise ValueError(f"Unknown rate limit policy type: {policy_type}")
+    return POLICY_TYPES[policy_type](**params)
+
+def evaluate_checks(checks: List[Tuple[str, RateLimitPolicy]], states: List[Any],
+                    now: float) -> Tuple[bool, float, List[Tuple[str, Any, float]]]:
+    """
+    Evaluate every check against its current state
+    Returns: (is_limited, retry_after, [(key, new_state, ttl), ...] to write when not limited)
+    """
+    limited = False
+    retry_after = 0.0
+    writes = []
+    for (key, policy), state in zip(checks, states):
+        allowed, wait, new_state, ttl = policy.evaluate(state, now)
+        if not allowed:
+            limited = True
+            retry_after = max(retry_after, wait)
+        writes.append((key, new_state, ttl))
+    return limited, retry_after, writes
+
+class RateLimitStore:
+    """
+    Storage backend for rate-limit state
+    apply() must evaluate and commit all checks for a hit atomically, so a denial
+    in one scope never consumes quota in another
+    """
+    
+    # Shared stores compare timestamps across processes, so they need wall-clock time
+    clock = staticmethod(time.time)
+    # Whether apply() does I/O that must be kept off the event loop
+    blocking = True
+    
+    def apply(self, checks: List[Tuple[str, RateLimitPolicy]]) -> Tuple[bool, float]:
+        """Evaluate and record a hit. Returns: (is_limited, retry_after)"""
+        raise NotImplementedError
+    
+    def apply_many(self, batch: List[List[Tuple[str, RateLimitPolicy]]]) -> List[Tuple[bool, float]]:
+        """Evaluate and record several hits in order, in as few round trips as the store allows"""
+        return [self.apply(checks) for checks in batch]
+    
+    def get(self, key: str) -> Any:
+        """Get the live state for a key, or None"""
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        """Release any resources held by the store"""
+
+class MemoryStore(RateLimitStore):
+    """Process-local store with expiring entries and a size cap"""
+    
+    clock = staticmethod(time.monotonic)
+    blocking = False
+    
+    def __init__(self, max_entries: int = RATE_LIMIT_MAX_ENTRIES):
+        # key -> (policy state, time the state expires), oldest first
+        self.entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.max_entries = max_entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def _evict(self, now: float) -> None:
+        """Drop expired entries from the oldest end and enforce the size cap"""
+        while self.entries:
+            oldest = next(iter(self.entries))
+            if self.entries[oldest][1] > now and len(self.entries) <= self.max_entries:
+                break
+            del self.entries[oldest]
+    
+    def get(self, key: str) -> Any:
+        entry = self.entries.get(key)
+        if entry is None or entry[1] <= self.clock():
+            return None
+        return entry[0]
+    
+    def apply(self, checks: List[Tuple[str, RateLimitPolicy]]) -> Tuple[bool, float]:
+        now = self.clock()
+        states = []
+        for key, _ in checks:
+            entry = self.entries.get(key)
+            states.append(entry[0] if entry is not None and entry[1] > now else None)
+        
+        limited, retry_after, writes = evaluate_checks(checks, states, now)
+        if limited:
+            return True, retry_after
+        
+        for key, new_state, ttl in writes:
+            # Re-insert at the newest end so eviction order follows last use
+            self.entries.pop(key, None)
+            self.entries[key] = (new_state, now + ttl)
+        self._evict(now)
+        return False, 0.0
+
+class SQLiteStore(RateLimitStore):
+    """Store shared by processes on one host through a SQLite database in WAL mode"""
+    
+    # Delete expired rows once every this many writes
+    CLEANUP_INTERVAL = 1000
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limits '
+            '(key TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._writes = 0
+    
+    def __len__(self) -> int:
+        return self.conn.execute(
+            'SELECT COUNT(*) FROM rate_limits WHERE expires_at > ?', (self.clock(),)
+        ).fetchone()[0]
+    
+    def get(self, key: str) -> Any:
+        row = self.conn.execute(
+            'SELECT state FROM rate_limits WHERE key = ? AND expires_at > ?', (key, self.clock())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def apply(self, checks: List[Tuple[str, RateLimitPolicy]]) -> Tuple[bool, float]:
+        return self.apply_many([checks])[0]
+    
+    def apply_many(self, batch: List[List[Tuple[str, RateLimitPolicy]]]) -> List[Tuple[bool, float]]:
+        keys = list({key: None for checks in batch for key, _ in checks})
+        # BEGIN IMMEDIATE takes the write lock up front so the read-evaluate-write is atomic
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = self.clock()
+            rows = self.conn.execute(
+                f"SELECT key, state FROM rate_limits WHERE key IN ({','.join('?' * len(keys))}) "
+                "AND expires_at > ?", (*keys, now)
+            ).fetchall()
+            found = {key: json.loads(state) for key, state in rows}
+            
+            # Hits are evaluated in order, each seeing the writes of the ones before it
+            results = []
+            changed = {}
+            for checks in batch:
+                limited, retry_after, writes = evaluate_checks(checks, [found.get(key) for key, _ in checks], now)
+                results.append((limited, retry_after))
+                if not limited:
+                    for key, new_state, ttl in writes:
+                        found[key] = new_state
+                        changed[key] = (json.dumps(new_state), now + ttl)
+            
+            if changed:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO rate_limits (key, state, expires_at) VALUES (?, ?, ?)',
+                    [(key, state, expires_at) for key, (state, expires_at) in changed.items()]
+                )
+                self._writes += 1
+                if self._writes % self.CLEANUP_INTERVAL == 0:
+                    self.conn.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        
+        return results
+    
+    def close(self) -> None:
+        self.conn.close()
+
+class RedisError(RuntimeError):
+    """Error reply from the Redis server"""
+
+class RESPConnection:
+    """Minimal blocking client for the Redis serialization protocol with pipelining"""
+    
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 1.0):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.sock: Optional[socket.socket] = None
+        self.reader = None
     
-    def __init__(self):
-        self.user_cooldowns: Dict[int, Dict[str, float]] = {}
+    def _connect(self) -> None:
+        self.sock = socket.create_connection(self.address, timeout=self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile('rb')
+        setup = []
+        if self.password:
+            setup.append(('AUTH', self.password))
+        if self.db:
+            setup.append(('SELECT', self.db))
+        if setup:
+            self.pipeline(*setup)
     
-    def is_rate_limited(self, user_id: int, command: str) -> Tuple[bool, float]:
+    @staticmethod
+    def _encode(command: Tuple) -> bytes:
+        parts = [f"*{len(command)}\r\n".encode()]
+        for arg in command:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b''.join(parts)
+    
+    def _read_reply(self) -> Any:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            # Returned rather than raised, so the replies after it are still read
+            return RedisError(f"Redis error: {payload.decode()}")
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2].decode()
+        if kind == b'*':
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RuntimeError(f"Unexpected Redis reply: {line!r}")
+    
+    def pipeline(self, *commands: Tuple, raise_errors: bool = True) -> List[Any]:
         """
-        Check if user is rate limited for a command
-        Returns: (is_limited, remaining_time)
+        Send several commands in one write and read all replies, returns the replies in order
+        An error reply raises RedisError once every reply is read, or is returned in its
+        place when `raise_errors` is False.
         """
-        now = time.time()
-        cooldown = RATE_LIMITS.get(command, 5)
+        if self.sock is None:
+            self._connect()
+        try:
+            self.sock.sendall(b''.join(self._encode(command) for command in commands))
+            replies = [self._read_reply() for _ in commands]
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+        if raise_errors:
+            for reply in replies:
+                if isinstance(reply, RedisError):
+                    raise reply
+        return replies
+    
+    def close(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            self.reader = None
+
+# Evaluates and commits every check of a hit in one server-side step, the Lua form of
+# evaluate_checks. KEYS are the scope keys, ARGV[1] is the time and each key then takes
+# three ARGV entries from RateLimitPolicy.script_args(). States are stored as JSON.
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limited, retry_after = false, 0
+local writes = {}
+for i, key in ipairs(KEYS) do
+    local kind, a, b = ARGV[3 * i - 1], tonumber(ARGV[3 * i]), tonumber(ARGV[3 * i + 1])
+    local raw = redis.call('GET', key)
+    local state = raw and cjson.decode(raw) or nil
+    local allowed, wait, new_state, ttl = true, 0, nil, 0
+    if kind == 'cooldown' then
+        if state and state > now then
+            allowed, wait, new_state, ttl = false, state - now, state, state - now
+        else
+            new_state, ttl = now + a, a
+        end
+    elseif kind == 'token_bucket' then
+        local tokens = b
+        if state then
+            tokens = math.min(b, state[1] + (now - state[2]) * a)
+        end
+        if tokens >= 1 then
+            tokens = tokens - 1
+        else
+            allowed, wait = false, (1 - tokens) / a
+        end
+        new_state, ttl = {tokens, now}, (b - tokens) / a
+    else
+        local cutoff = now - b
+        new_state = {}
+        for _, hit in ipairs(state or {}) do
+            if hit > cutoff then
+                new_state[#new_state + 1] = hit
+            end
+        end
+        if #new_state < a then
+            new_state[#new_state + 1] = now
+            ttl = b
+        else
+            allowed, wait, ttl = false, new_state[1] - cutoff, new_state[#new_state] - cutoff
+        end
+    end
+    if not allowed then
+        limited = true
+        retry_after = math.max(retry_after, wait)
+    end
+    writes[i] = {cjson.encode(new_state), ttl}
+end
+if limited then
+    return {1, tostring(retry_after)}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, writes[i][1], 'PX', math.max(1, math.floor(writes[i][2] * 1000)))
+end
+return {0, '0'}
+"""
+
+class RedisStore(RateLimitStore):
+    """
+    Store shared across hosts through any server speaking the Redis protocol
+    Each hit is one EVALSHA running RATE_LIMIT_SCRIPT, and a batch of hits is pipelined
+    into one round trip. Servers without scripting, and policies with no script form,
+    fall back to a WATCH/MULTI transaction per hit.
+    """
+    
+    # Optimistic transaction attempts before giving up on a contended key
+    MAX_ATTEMPTS = 5
+    SCRIPT_SHA = hashlib.sha1(RATE_LIMIT_SCRIPT.encode()).hexdigest()
+    
+    def __init__(self, connection: RESPConnection, prefix: str = 'unbot:rl:'):
+        self.conn = connection
+        self.prefix = prefix
+        self.scripting = True
+    
+    @classmethod
+    def from_url(cls, url: str) -> 'RedisStore':
+        """Create a store from a redis://[:password@]host[:port][/db] URL"""
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip('/') or 0)
+        return cls(RESPConnection(parsed.hostname or 'localhost', parsed.port or 6379, db, parsed.password))
+    
+    def get(self, key: str) -> Any:
+        value = self.conn.pipeline(('GET', self.prefix + key))[0]
+        return json.loads(value) if value is not None else None
+    
+    def apply(self, checks: List[Tuple[str, RateLimitPolicy]]) -> Tuple[bool, float]:
+        return self.apply_many([checks])[0]
+    
+    def apply_many(self, batch: List[List[Tuple[str, RateLimitPolicy]]]) -> List[Tuple[bool, float]]:
+        results: List[Optional[Tuple[bool, float]]] = [None] * len(batch)
+        scripted = []
+        if self.scripting:
+            for index, checks in enumerate(batch):
+                script_args = [policy.script_args() for _, policy in checks]
+                if None not in script_args:
+                    scripted.append((index, checks, script_args))
+        
+        if scripted:
+            try:
+                replies = self._apply_scripts([(checks, script_args) for _, checks, script_args in scripted])
+            except RedisError as e:
+                if 'unknown command' not in str(e).lower():
+                    raise
+                logger.warning("Redis server has no scripting, using transactions: %s", e)
+                self.scripting = False
+            else:
+                for (index, _, _), reply in zip(scripted, replies):
+                    results[index] = reply
         
-        if user_id not in self.user_cooldowns:
-            self.user_cooldowns[user_id] = {}
+        return [
+            result if result is not None else self._apply_transaction(checks)
+            for result, checks in zip(results, batch)
+        ]
+    
+    def _script_command(self, name: str, checks: List[Tuple[str, RateLimitPolicy]],
+                        script_args: List[Tuple[str, float, float]]) -> Tuple:
+        keys = [self.prefix + key for key, _ in checks]
+        args = [self.clock()] + [value for policy_args in script_args for value in policy_args]
+        return (name, self.SCRIPT_SHA if name == 'EVALSHA' else RATE_LIMIT_SCRIPT, len(keys), *keys, *args)
+    
+    def _apply_scripts(self, items: List[Tuple[List[Tuple[str, RateLimitPolicy]], List[Tuple[str, float, float]]]]
+                       ) -> List[Tuple[bool, float]]:
+        """Run the script for every hit in one pipelined round trip"""
+        replies = self.conn.pipeline(*(self._script_command('EVALSHA', *item) for item in items),
+                                     raise_errors=False)
+        missing = [index for index, reply in enumerate(replies)
+                   if isinstance(reply, RedisError) and 'NOSCRIPT' in str(reply)]
+        if missing:
+            # First use on this server: send the script itself, which also caches it
+            resent = self.conn.pipeline(*(self._script_command('EVAL', *items[index]) for index in missing),
+                                        raise_errors=False)
+            for index, reply in zip(missing, resent):
+                replies[index] = reply
         
-        if command in self.user_cooldowns[user_id]:
-            last_used = self.user_cooldowns[user_id][command]
-            remaining = cooldown - (now - last_used)
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return [(bool(limited), float(retry_after)) for limited, retry_after in replies]
+    
+    def _apply_transaction(self, checks: List[Tuple[str, RateLimitPolicy]]) -> Tuple[bool, float]:
+        keys = [self.prefix + key for key, _ in checks]
+        for _ in range(self.MAX_ATTEMPTS):
+            # One round trip to watch and read every scope, one to commit every write
+            _, values = self.conn.pipeline(('WATCH', *keys), ('MGET', *keys))
+            now = self.clock()
+            states = [json.loads(value) if value is not None else None for value in values]
+            
+            limited, retry_after, writes = evaluate_checks(checks, states, now)
+            if limited:
+                self.conn.pipeline(('UNWATCH',))
+                return True, retry_after
             
-            if remaining > 0:
-                return True, remaining
+            commands = [('MULTI',)]
+            for key, new_state, ttl in writes:
+                commands.append(('SET', self.prefix + key, json.dumps(new_state), 'PX', max(1, int(ttl * 1000))))
+            commands.append(('EXEC',))
+            if self.conn.pipeline(*commands)[-1] is not None:
+                return False, 0.0
         
-        self.user_cooldowns[user_id][command] = now
-        return False, 0.0
+        raise RuntimeError(f"Rate limit transaction kept conflicting for {keys}")
+    
+    def close(self) -> None:
+        self.conn.close()
+
+def create_store(url: str = RATE_LIMIT_STORE) -> RateLimitStore:
+    """Create a store from 'memory', 'sqlite:///path/to/file.db' or 'redis://host:port/db'"""
+    if url == 'memory':
+        return MemoryStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteStore(url[len('sqlite:///'):])
+    if url.startswith('redis://'):
+        return RedisStore.from_url(url)
+    raise ValueError(f"Unknown rate limit store: {url}")
+
+class RateLimiter:
+    """
+    Rate limiter for bot commands
+    Every hit is checked against the user's policy for the command (a fixed cooldown from
+    RATE_LIMITS unless RATE_LIMIT_POLICIES overrides it) plus any guild and global policies.
+    """
+    
+    def __init__(self, max_entries: int = RATE_LIMIT_MAX_ENTRIES,
+                 policies: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None,
+                 store: Optional[RateLimitStore] = None):
+        self.store = store if store is not None else (
+            MemoryStore(max_entries) if RATE_LIMIT_STORE == 'memory' else create_store()
+        )
+        self.policies = {
+            key: build_policy(spec)
+            for key, spec in (RATE_LIMIT_POLICIES if policies is None else policies).items()
+        }
+        self._user_policies: Dict[str, RateLimitPolicy] = {}
+        # One thread for blocking stores, which also serializes use of their connection
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Checks waiting for the next batch to a blocking store, and the task sending them
+        self._pending: List[Tuple[List[Tuple[str, RateLimitPolicy]], asyncio.Future]] = []
+        self._drain_task: Optional[asyncio.Task] = None
+    
+    def __len__(self) -> int:
+        return len(self.store)
+    
+    def _user_policy(self, command: str) -> RateLimitPolicy:
+        """Get the per-user policy for a command"""
+        policy = self._user_policies.get(command)
+        if policy is None:
+            policy = self.policies.get(('user', command)) or CooldownPolicy(RATE_LIMITS.get(command, 5))
+            self._user_policies[command] = policy
+        return policy
+    
+    def _scopes(self, user_id: int, command: str, guild_id: Optional[int]) -> List[Tuple[str, RateLimitPolicy]]:
+        """List every (scope key, policy) pair a hit has to pass"""
+        scopes = [(f"user:{user_id}:{command}", self._user_policy(command))]
+        for name in (command, '*'):
+            if guild_id is not None and ('guild', name) in self.policies:
+                scopes.append((f"guild:{guild_id}:{name}", self.policies[('guild', name)]))
+            if ('global', name) in self.policies:
+                scopes.append((f"global:{name}", self.policies[('global', name)]))
+        return scopes
+    
+    def is_rate_limited(self, user_id: int, command: str, guild_id: Optional[int] = None) -> Tuple[bool, float]:
+        """
+        Check if user is rate limited for a command
+        Returns: (is_limited, remaining_time)
+        """
+        try:
+            return self.store.apply(self._scopes(user_id, command, guild_id))
+        except Exception as e:
+            # Fail open: an unavailable shared store should not take the bot down
+            logger.error("Rate limit store error: %s", e)
+            return False, 0.0
+    
+    async def is_rate_limited_async(self, user_id: int, command: str,
+                                    guild_id: Optional[int] = None) -> Tuple[bool, float]:
+        """
+        is_rate_limited for the event loop, running checks against a shared store on a worker thread
+        Checks made while a batch is in flight are sent together as the next batch, so a
+        busy process needs one round trip per batch rather than one per command.
+        """
+        if not self.store.blocking:
+            return self.is_rate_limited(user_id, command, guild_id)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((self._scopes(user_id, command, guild_id), future))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.ensure_future(self._drain())
+        return await future
+    
+    async def _drain(self) -> None:
+        """Send waiting checks to the store in batches, one batch in flight at a time"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rate-limit')
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch = self._pending[:RATE_LIMIT_BATCH_SIZE]
+            del self._pending[:RATE_LIMIT_BATCH_SIZE]
+            try:
+                results = await loop.run_in_executor(self._executor, self._apply_batch,
+                                                     [checks for checks, _ in batch])
+            except asyncio.CancelledError:
+                # Shutting down: nobody should wait on a batch that will never be sent
+                for _, future in batch + self._pending:
+                    future.cancel()
+                self._pending.clear()
+                raise
+            except Exception as e:
+                logger.error("Rate limit store error: %s", e)
+                results = [(False, 0.0)] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+    
+    def _apply_batch(self, batch: List[List[Tuple[str, RateLimitPolicy]]]) -> List[Tuple[bool, float]]:
+        """Apply a batch of checks on the worker thread, failing open like is_rate_limited"""
+        try:
+            return self.store.apply_many(batch)
+        except Exception as e:
+            logger.error("Rate limit store error: %s", e)
+            return [(False, 0.0)] * len(batch)
     
     def get_remaining_time(self, user_id: int, command: str) -> float:
-        """Get remaining cooldown time for a command"""
-        if user_id not in self.user_cooldowns:
+        """Get remaining time before the user's policy for a command allows another use"""
+        try:
+            state = self.store.get(f"user:{user_id}:{command}")
+        except Exception as e:
+            logger.error("Rate limit store error: %s", e)
             return 0.0
-        
-        if command not in self.user_cooldowns[user_id]:
+        if state is None:
             return 0.0
         
-        now = time.time()
-        cooldown = RATE_LIMITS.get(command, 5)
-        last_used = self.user_cooldowns[user_id][command]
-        remaining = cooldown - (now - last_used)
-        
-        return max(0.0, remaining)
+        allowed, wait, _, _ = self._user_policy(command).evaluate(state, self.store.clock())
+        return 0.0 if allowed else wait
+    
+    def close(self) -> None:
+        """Close the underlying store"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.store.close()
@@ -0,0 +1,119 @@
+"""Local catalog of UN resolutions for /resolution lookups"""
+import asyncio
+import logging
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import RESOLUTION_CATALOG_FILE
+
+logger = logging.getLogger(__name__)
+
+class ResolutionCatalog:
+    """
+    SQLite table of resolutions keyed by (body, number)
+    body is 'SC' or 'GA'. General Assembly numbers restart every session, so the
+    most recently ingested session wins for a given number. From the event loop use the
+    *_async methods: another process holding the write lock can block a call for seconds.
+    """
+    
+    def __init__(self, path: str = RESOLUTION_CATALOG_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS resolutions '
+            '(body TEXT NOT NULL, number INTEGER NOT NULL, title TEXT NOT NULL, date TEXT, url TEXT NOT NULL, '
+            'PRIMARY KEY (body, number)) WITHOUT ROWID'
+        )
+        self.conn.commit()
+        # One thread for calls from the event loop, which also serializes use of the connection
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM resolutions').fetchone()[0]
+    
+    def get(self, body: str, number: int) -> Optional[Dict]:
+        """Look up a resolution by primary key"""
+        row = self.conn.execute(
+            'SELECT title, date, url FROM resolutions WHERE body = ? AND number = ?', (body.upper(), number)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        return {'type': body.upper(), 'number': number, 'title': row[0], 'date': row[1], 'url': row[2]}
+    
+    def add_many(self, records: Iterable[Dict]) -> int:
+        """Insert or replace records shaped like get() results, returns how many were written"""
+        rows = [
+            (record['type'].upper(), int(record['number']), record['title'], record.get('date'), record['url'])
+            for record in records
+        ]
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO resolutions (body, number, title, date, url) VALUES (?, ?, ?, ?, ?)', rows
+            )
+        return len(rows)
+    
+    async def _run(self, func, *args):
+        """Run a catalog call on the catalog's worker thread"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='resolution-catalog')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    async def get_async(self, body: str, number: int) -> Optional[Dict]:
+        """get() off the event loop"""
+        return await self._run(self.get, body, number)
+    
+    async def add_many_async(self, records: Iterable[Dict]) -> int:
+        """add_many() off the event loop"""
+        return await self._run(self.add_many, list(records))
+    
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.conn.close()
+
+def current_periods(today: Optional[date] = None) -> List[Tuple[str, int]]:
+    """Listing pages that can still gain resolutions: this year's SC page and the current GA session"""
+    today = today or date.today()
+    # The General Assembly opens a new session every September, the 1st in 1946
+    session = today.year - 1945 if today.month >= 9 else today.year - 1946
+    return [('SC', today.year), ('GA', session)]
+
+def all_periods(today: Optional[date] = None) -> List[Tuple[str, int]]:
+    """Every Security Council year and General Assembly session up to now"""
+    today = today or date.today()
+    _, session = current_periods(today)[1]
+    return ([('SC', year) for year in range(1946, today.year + 1)]
+            + [('GA', number) for number in range(1, session + 1)])
+
+async def ingest(scraper, catalog: ResolutionCatalog, periods: List[Tuple[str, int]]) -> int:
+    """Fetch the given listing pages and write their resolutions into the catalog"""
+    written = 0
+    for body, period in periods:
+        records = await scraper.ingest_resolutions(body, period)
+        if records:
+            written += await catalog.add_many_async(records)
+    
+    logger.info("Ingested %s resolution(s) from %s listing page(s)", written, len(periods))
+    return written
+
+async def backfill(path: str = RESOLUTION_CATALOG_FILE) -> int:
+    """Bulk ingestion job filling the catalog from every listing page"""
+    from .un_scraper import UNScraper
+    
+    catalog = ResolutionCatalog(path)
+    try:
+        async with UNScraper() as scraper:
+            return await ingest(scraper, catalog, all_periods())
+    finally:
+        catalog.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    written = asyncio.run(backfill(*sys.argv[1:2]))
+    print(f"✅ Ingested {written} resolution(s) into the catalog")
@@ -0,0 +1,81 @@
+"""Shard assignment and per-shard health for running the bot across processes"""
+import json
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+def parse_shard_ids(spec: Optional[str]) -> Optional[List[int]]:
+    """Parse a shard id list like '0-3' or '0,2,5', None when unset"""
+    if not spec:
+        return None
+    
+    shard_ids = []
+    for part in spec.split(','):
+        part = part.strip()
+        if '-' in part:
+            first, last = part.split('-', 1)
+            shard_ids.extend(range(int(first), int(last) + 1))
+        elif part:
+            shard_ids.append(int(part))
+    return sorted(set(shard_ids))
+
+def format_shard_ids(shard_ids: List[int]) -> str:
+    """Inverse of parse_shard_ids for a contiguous range"""
+    if len(shard_ids) == 1:
+        return str(shard_ids[0])
+    return f"{shard_ids[0]}-{shard_ids[-1]}"
+
+def shard_ranges(shard_count: int, processes: int) -> List[List[int]]:
+    """Split shards 0..shard_count-1 into contiguous, near-equal ranges for each process"""
+    processes = max(1, min(processes, shard_count))
+    base, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for index in range(processes):
+        size = base + (1 if index < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+def is_primary(shard_ids: Optional[List[int]]) -> bool:
+    """Whether this process runs once-per-deployment work, owned by whoever holds shard 0"""
+    return shard_ids is None or 0 in shard_ids
+
+def shard_health(bot: discord.Client) -> List[Dict[str, Any]]:
+    """Latency, guild count and connection state of each shard this process runs"""
+    guild_counts: Dict[int, int] = {}
+    for guild in bot.guilds:
+        guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+    
+    shards = getattr(bot, 'shards', None)
+    if shards is None:
+        # Unsharded client: one connection acting as shard 0
+        shards = {bot.shard_id or 0: bot}
+    
+    report = []
+    for shard_id, shard in sorted(shards.items()):
+        latency = shard.latency
+        report.append({
+            'shard_id': shard_id,
+            'latency_ms': round(latency * 1000, 1) if math.isfinite(latency) else None,
+            'guilds': guild_counts.get(shard_id, 0),
+            'closed': shard.is_closed(),
+            'rate_limited': shard.is_ws_ratelimited()
+        })
+    return report
+
+def write_health(report: List[Dict[str, Any]], directory: str) -> None:
+    """Write one JSON status file per shard so a supervisor can read them"""
+    os.makedirs(directory, exist_ok=True)
+    for shard in report:
+        path = os.path.join(directory, f"shard-{shard['shard_id']}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({**shard, 'pid': os.getpid(), 'updated_at': time.time()}, f)
+        os.replace(tmp_path, path)
@@ -1,19 +1,379 @@
 """UN Website Scraper for real-time data extraction"""
 import aiohttp
 import asyncio
+import codecs
 import logging
-from typing import Dict, List, Optional
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus, urljoin, urlparse
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 
+from .config import (
+    SCRAPER_TIMEOUT, SCRAPER_CONNECTION_LIMIT, SCRAPER_CONNECTIONS_PER_HOST,
+    SCRAPER_KEEPALIVE_TIMEOUT, SCRAPER_DNS_CACHE_TTL, SCRAPER_CACHE_TTLS, SCRAPER_CACHE_MAX_ENTRIES,
+    SCRAPER_PARSE_EXECUTOR, SCRAPER_PARSE_WORKERS, SCRAPER_PARSE_QUEUE_SIZE,
+    SCRAPER_STREAMING, SCRAPER_STREAM_CHUNK_SIZE, SCRAPER_AGGREGATE_CONCURRENCY,
+    SCRAPER_SOURCE_DEADLINES, SCRAPER_MIN_TIMEOUT, SCRAPER_TIMEOUT_P95_MULTIPLIER,
+    SCRAPER_BREAKER_FAILURES, SCRAPER_BREAKER_RESET, SCRAPER_RETRY_RATIO, SCRAPER_MAX_RETRIES
+)
+
 logger = logging.getLogger(__name__)
 
+CHAPTER_PATTERN = re.compile(r'^chapter\s+[ivxlc]+\b\s*[:.\-–—]?\s*(.*)$', re.IGNORECASE)
+ARTICLE_PATTERN = re.compile(r'^article\s+(\d+)\b', re.IGNORECASE)
+# S/RES/2707 (2023) or A/RES/78/123, the session is optional for the General Assembly
+RESOLUTION_PATTERN = re.compile(r'\b([SA])/RES/(?:\d+/)?(\d+)\b')
+DATE_PATTERN = re.compile(r'\b(\d{1,2} [A-Z][a-z]+ \d{4}|\d{4}-\d{2}-\d{2})\b')
+
+def parse_charter(html: str) -> Dict[str, Dict[str, str]]:
+    """
+    Parse the official Charter page into {article number: {'title', 'content'}}
+    Same shape as data/un_charter.json: the title is the enclosing chapter's title and
+    the content is the article's paragraphs separated by blank lines.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    articles: Dict[str, Dict[str, Any]] = {}
+    chapter_title = ''
+    current = None
+    for element in soup.find_all(['h2', 'h3', 'h4', 'h5', 'p']):
+        text = element.get_text(' ', strip=True)
+        if not text:
+            continue
+        
+        chapter = CHAPTER_PATTERN.match(text)
+        if chapter and element.name != 'p':
+            chapter_title = chapter.group(1)
+            current = None
+            continue
+        
+        article = ARTICLE_PATTERN.match(text)
+        if article and (element.name != 'p' or len(text) < 20):
+            current = articles.setdefault(article.group(1), {'title': chapter_title, 'paragraphs': []})
+            continue
+        
+        if current is not None and element.name == 'p':
+            current['paragraphs'].append(text)
+    
+    return {
+        number: {'title': article['title'], 'content': '\n\n'.join(article['paragraphs'])}
+        for number, article in sorted(articles.items(), key=lambda item: int(item[0]))
+        if article['paragraphs']
+    }
+
+def is_news_link(href: str, title: str) -> bool:
+    """Whether a link on the UN News page looks like an article"""
+    return bool(title) and len(title) > 10 and 'un.org' in href
+
+def news_item(href: str, title: str) -> Dict:
+    """Build a news item from an article link"""
+    return {
+        'title': title,
+        'url': href if href.startswith('http') else f"https://news.un.org{href}",
+        'source': 'UN News'
+    }
+
+def is_meeting_link(href: str, title: str) -> bool:
+    """Whether a link on the Security Council page refers to a meeting or session"""
+    return 'meeting' in title.lower() or 'session' in title.lower()
+
+def meeting_item(href: str, title: str) -> Dict:
+    """Build a Security Council update from a meeting link"""
+    return {
+        'title': title,
+        'url': href if href.startswith('http') else f"https://www.un.org{href}",
+        'source': 'Security Council'
+    }
+
+def is_press_link(href: str, title: str) -> bool:
+    """Whether a link on the press releases page looks like a release"""
+    return len(title) > 10 and ('press.un.org' in href or href.startswith('/en/'))
+
+def press_item(href: str, title: str) -> Dict:
+    """Build a press release item from a link"""
+    return {
+        'title': title,
+        'url': href if href.startswith('http') else f"https://press.un.org{href}",
+        'source': 'UN Press'
+    }
+
+def is_assembly_link(href: str, title: str) -> bool:
+    """Whether a link on the General Assembly page refers to a session or meeting"""
+    lowered = title.lower()
+    return len(title) > 10 and ('session' in lowered or 'meeting' in lowered or 'assembly' in lowered)
+
+def assembly_item(href: str, title: str) -> Dict:
+    """Build a General Assembly update from a link"""
+    return {
+        'title': title,
+        'url': href if href.startswith('http') else f"https://www.un.org{href}",
+        'source': 'General Assembly'
+    }
+
+def is_record_link(href: str, title: str) -> bool:
+    """Whether a link on the Digital Library page points at a document record"""
+    return '/record/' in href and len(title) > 10
+
+def record_item(href: str, title: str) -> Dict:
+    """Build a Digital Library item from a record link"""
+    return {
+        'title': title,
+        'url': href if href.startswith('http') else f"https://digitallibrary.un.org{href}",
+        'source': 'UN Digital Library'
+    }
+
+# source -> (link predicate, item builder) for sources that publish lists of updates
+SOURCE_LINKS = {
+    'news': (is_news_link, news_item),
+    'press': (is_press_link, press_item),
+    'security_council': (is_meeting_link, meeting_item),
+    'general_assembly': (is_assembly_link, assembly_item),
+    'digital_library': (is_record_link, record_item)
+}
+
+def dedupe_key(item: Dict) -> Tuple[str, str]:
+    """Key identifying the same update linked from several sources"""
+    url = item['url'].split('#', 1)[0].rstrip('/').lower()
+    return url, item['title'].casefold()
+
+class UpstreamUnavailable(Exception):
+    """Raised when a UN host is failing fast (circuit open) or a request failed with no retries left"""
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker with a latency-adaptive request timeout
+    closed: requests flow, consecutive failures are counted
+    open: requests fail fast until `reset_after` seconds pass
+    half_open: a single probe request decides between closed and open
+    """
+    
+    def __init__(self, failure_threshold: int = SCRAPER_BREAKER_FAILURES,
+                 reset_after: float = SCRAPER_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        # Recent successful request latencies, used to derive the timeout
+        self.latencies: deque = deque(maxlen=100)
+    
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        if self.state == 'open':
+            if time.monotonic() - self.opened_at < self.reset_after:
+                return False
+            self.state = 'half_open'
+            self._probing = False
+        
+        if self.state == 'half_open':
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+    
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.failures = 0
+        self.state = 'closed'
+        self._probing = False
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            if self.state != 'open':
+                logger.warning("Circuit opened after %s failure(s)", self.failures)
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+        self._probing = False
+    
+    def release(self) -> None:
+        """End a request that produced no result (cancelled or failed locally), freeing the probe slot"""
+        self._probing = False
+    
+    def timeout(self) -> float:
+        """Request timeout from observed p95 latency, the configured maximum until enough samples exist"""
+        if len(self.latencies) < 10:
+            return SCRAPER_TIMEOUT
+        ordered = sorted(self.latencies)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        return min(SCRAPER_TIMEOUT, max(SCRAPER_MIN_TIMEOUT, p95 * SCRAPER_TIMEOUT_P95_MULTIPLIER))
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of request volume so retries cannot amplify an outage
+    Every request earns `ratio` of a retry and every retry spends a whole one.
+    """
+    
+    def __init__(self, ratio: float = SCRAPER_RETRY_RATIO, reserve: float = 10.0):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = reserve
+    
+    def record_request(self) -> None:
+        self.balance = min(self.reserve, self.balance + self.ratio)
+    
+    def try_spend(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+class LinkExtractor(HTMLParser):
+    """
+    Incremental <a href> extractor fed with chunks of a page as they arrive
+    Collects (href, text) pairs accepted by `accept` and reports done once `limit` are found.
+    """
+    
+    def __init__(self, accept: Callable[[str, str], bool], limit: int):
+        super().__init__(convert_charrefs=True)
+        self.accept = accept
+        self.limit = limit
+        self.links: List[Tuple[str, str]] = []
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+    
+    @property
+    def done(self) -> bool:
+        return len(self.links) >= self.limit
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a' and not self.done:
+            href = dict(attrs).get('href')
+            if href is not None:
+                self._href = href
+                self._text = []
+    
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+    
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._href is not None:
+            # Same text as BeautifulSoup's get_text(strip=True)
+            title = ''.join(piece.strip() for piece in self._text)
+            if not self.done and self.accept(self._href, title):
+                self.links.append((self._href, title))
+            self._href = None
+    
+    def finish(self, text: str) -> None:
+        """Feed the last piece of the page and flush what the parser still buffers"""
+        self.feed(text)
+        self.close()
+
+def extract_links(html: str, accept: Callable[[str, str], bool], limit: int) -> List[Tuple[str, str]]:
+    """Extract the first `limit` accepted (href, text) links from a complete page"""
+    extractor = LinkExtractor(accept, limit)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.links
+
+def extract_news(html: str, limit: int) -> List[Dict]:
+    """Extract news article links from the UN News page"""
+    return [news_item(href, title) for href, title in extract_links(html, is_news_link, limit)]
+
+def extract_security_council_updates(html: str, limit: int = 3) -> List[Dict]:
+    """Extract meeting links from the Security Council page"""
+    return [meeting_item(href, title) for href, title in extract_links(html, is_meeting_link, limit)]
+
+def extract_resolution(html: str, resolution_type: str, number: int) -> Optional[Dict]:
+    """Extract the first matching resolution link from a Digital Library search page"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Look for resolution links
+    resolution_links = soup.find_all('a', href=True)
+    
+    for link in resolution_links:
+        href = link.get('href', '')
+        title = link.get_text(strip=True)
+        
+        if str(number) in title and ('resolution' in title.lower() or 'res' in title.lower()):
+            return {
+                'title': title,
+                'url': href if href.startswith('http') else f"https://digitallibrary.un.org{href}",
+                'type': resolution_type.upper(),
+                'number': number
+            }
+    
+    return None
+
+def matches_resolution(title: str, resolution_type: str, number: int) -> bool:
+    """Whether a title carries the exact symbol of the resolution, e.g. S/RES/2712 for ('sc', 2712)"""
+    prefix = 'S' if resolution_type.lower() == 'sc' else 'A'
+    return any(
+        symbol.group(1) == prefix and int(symbol.group(2)) == number
+        for symbol in RESOLUTION_PATTERN.finditer(title)
+    )
+
+def extract_resolution_listing(html: str, body: str, page_url: str) -> List[Dict]:
+    """
+    Extract resolutions from a Security Council year or General Assembly session listing
+    Each table row holding a resolution symbol becomes {'type', 'number', 'title', 'date', 'url'}.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    resolutions = {}
+    for row in soup.find_all('tr'):
+        cells = [cell.get_text(' ', strip=True) for cell in row.find_all(['td', 'th'])]
+        symbol = RESOLUTION_PATTERN.search(' '.join(cells))
+        link = row.find('a', href=True)
+        if symbol is None or link is None or symbol.group(1) != body[0]:
+            continue
+        
+        date = DATE_PATTERN.search(' '.join(cells))
+        # The subject is the longest cell that is not just the symbol or the date
+        descriptions = [
+            cell for cell in cells
+            if not RESOLUTION_PATTERN.search(cell) and not DATE_PATTERN.fullmatch(cell)
+        ]
+        number = int(symbol.group(2))
+        resolutions[number] = {
+            'type': body,
+            'number': number,
+            'title': max(descriptions, key=len) if descriptions else symbol.group(0),
+            'date': date.group(1) if date else None,
+            'url': urljoin(page_url, link['href'])
+        }
+    
+    return list(resolutions.values())
+
+def extract_policy_definition(html: str, term: str) -> Optional[Dict]:
+    """Extract the first relevant document link from a Digital Library search page"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Look for relevant documents
+    doc_links = soup.find_all('a', href=True)
+    
+    for link in doc_links[:3]:
+        href = link.get('href', '')
+        title = link.get_text(strip=True)
+        
+        if term.lower() in title.lower() and len(title) > 10:
+            return {
+                'title': title,
+                'url': href if href.startswith('http') else f"https://digitallibrary.un.org{href}",
+                'term': term,
+                'source': 'UN Digital Library'
+            }
+    
+    return None
+
 class UNScraper:
-    """Scraper for UN official websites"""
+    """
+    Scraper for UN official websites
+    
+    Either use as an async context manager for one-off scripts, or call start() once and
+    close() on shutdown to keep one pooled session (warm keep-alive connections) for the
+    life of the bot.
+    """
     
     def __init__(self):
-        self.session = None
+        self.session: Optional[aiohttp.ClientSession] = None
         self.base_urls = {
             'news': 'https://news.un.org/',
             'press': 'https://press.un.org/',
@@ -22,153 +382,442 @@ class UNScraper:
             'charter': 'https://www.un.org/en/about-us/un-charter',
             'digital_library': 'https://digitallibrary.un.org/'
         }
+        # Resolution listings per Security Council year and General Assembly session
+        self.resolution_urls = {
+            'SC': 'https://www.un.org/securitycouncil/content/resolutions-adopted-security-council-{period}',
+            'GA': 'https://www.un.org/en/ga/{period}/resolutions.shtml'
+        }
+        # url -> {'body', 'etag', 'last_modified', 'fetched_at'}, least recently used first
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # (url, accept, limit) -> {'links', 'etag', 'last_modified', 'fetched_at'} for streamed
+        # pages, whose bodies are only read up to the last link needed and never cached
+        self.link_cache: "OrderedDict[Tuple[str, Callable, int], Dict[str, Any]]" = OrderedDict()
+        # url, or (url, accept, limit) for streams -> request in progress, so concurrent
+        # callers share one upstream request
+        self._inflight: Dict[Any, asyncio.Task] = {}
+        # Structured Charter parsed from the last fetched page body
+        self._charter_articles: Dict[str, Dict[str, str]] = {}
+        self._charter_body: Optional[str] = None
+        # Worker pool for HTML parsing, so large pages never block the event loop. Streamed
+        # pages keep their extractor between chunks, so they need threads even with processes
+        self.parse_pool: Optional[Executor] = None
+        self.stream_pool: Optional[Executor] = None
+        self._parse_slots: Optional[asyncio.Semaphore] = None
+        self.parse_stats = {'waiting': 0, 'in_pool': 0, 'peak_depth': 0, 'completed': 0}
+        # host -> circuit breaker, shared retry budget for all hosts
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retry_budget = RetryBudget()
     
-    async def __aenter__(self):
-        """Async context manager entry"""
+    async def start(self) -> None:
+        """Open the pooled HTTP session, safe to call more than once"""
+        if self.session and not self.session.closed:
+            return
+        
+        connector = aiohttp.TCPConnector(
+            limit=SCRAPER_CONNECTION_LIMIT,
+            limit_per_host=SCRAPER_CONNECTIONS_PER_HOST,
+            keepalive_timeout=SCRAPER_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=SCRAPER_DNS_CACHE_TTL,
+            use_dns_cache=True
+        )
         self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=SCRAPER_TIMEOUT),
             headers={
                 'User-Agent': 'UN-Discord-Bot/1.0 (Educational Purpose)'
             }
         )
+        if SCRAPER_PARSE_EXECUTOR == 'process':
+            self.parse_pool = ProcessPoolExecutor(max_workers=SCRAPER_PARSE_WORKERS)
+            self.stream_pool = ThreadPoolExecutor(max_workers=SCRAPER_PARSE_WORKERS,
+                                                  thread_name_prefix='un-stream')
+        else:
+            self.parse_pool = self.stream_pool = ThreadPoolExecutor(max_workers=SCRAPER_PARSE_WORKERS,
+                                                                    thread_name_prefix='un-parse')
+        # Bounds jobs handed to the pool (running plus queued); further callers wait
+        self._parse_slots = asyncio.Semaphore(SCRAPER_PARSE_QUEUE_SIZE)
+        logger.info("UN scraper session started")
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP session and its connections"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.info("UN scraper session closed")
+        self.session = None
+        for task in list(self._inflight.values()):
+            task.cancel()
+        for pool in {self.parse_pool, self.stream_pool} - {None}:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.parse_pool = self.stream_pool = None
+    
+    def parse_queue_depth(self) -> int:
+        """Number of parse jobs waiting for a worker, including those waiting for a pool slot"""
+        return self.parse_stats['waiting'] + max(0, self.parse_stats['in_pool'] - SCRAPER_PARSE_WORKERS)
+    
+    def parse_report(self) -> Dict[str, int]:
+        """Current parse queue depth and the peak since the previous report, which restarts it"""
+        stats = self.parse_stats
+        depth = self.parse_queue_depth()
+        report = {'queue_depth': depth, 'peak_depth': stats['peak_depth'],
+                  'running': min(stats['in_pool'], SCRAPER_PARSE_WORKERS), 'completed': stats['completed']}
+        stats['peak_depth'] = depth
+        return report
+    
+    async def parse(self, func: Callable, *args, pool: Optional[Executor] = None) -> Any:
+        """Run an HTML extraction function on the parse pool, or on `pool` sharing its slots"""
+        stats = self.parse_stats
+        stats['waiting'] += 1
+        stats['peak_depth'] = max(stats['peak_depth'], self.parse_queue_depth())
+        try:
+            await self._parse_slots.acquire()
+        finally:
+            stats['waiting'] -= 1
+        
+        stats['in_pool'] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool or self.parse_pool, func, *args)
+        finally:
+            stats['in_pool'] -= 1
+            stats['completed'] += 1
+            self._parse_slots.release()
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.start()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        await self.close()
+    
+    async def fetch(self, url: str, source: str) -> Optional[str]:
+        """
+        Fetch a page body through the response cache
+        Fresh entries are served without a request, stale ones are revalidated with
+        ETag/If-Modified-Since, and concurrent fetches of one URL share a single request.
+        """
+        entry = self.cache.get(url)
+        if entry is not None and time.monotonic() - entry['fetched_at'] < SCRAPER_CACHE_TTLS.get(source, 300):
+            self.cache.move_to_end(url)
+            return entry['body']
+        
+        inflight = self._inflight.get(url) or self._share(url, self._fetch_upstream(url, source, entry))
+        return await asyncio.shield(inflight)
+    
+    def _share(self, key: Any, upstream: Awaitable[Any]) -> asyncio.Task:
+        """
+        Run an upstream request as its own task, shared by every caller of `key`
+        Callers await it shielded, so one caller's deadline or cancellation never
+        cancels the request the others are waiting on.
+        """
+        task = asyncio.ensure_future(upstream)
+        self._inflight[key] = task
+        
+        def done(task: asyncio.Task) -> None:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+            # Mark the exception retrieved in case every caller gave up waiting
+            if not task.cancelled():
+                task.exception()
+        
+        task.add_done_callback(done)
+        return task
+    
+    async def request(self, url: str, handler: Callable[[aiohttp.ClientResponse], Awaitable[Any]],
+                      headers: Optional[Dict[str, str]] = None) -> Any:
+        """
+        GET a URL through its host's circuit breaker and run `handler` on the response
+        Timeouts, connection errors and 5xx responses count as failures and are retried
+        while the retry budget allows. Raises UpstreamUnavailable when the circuit is open
+        or the request failed for good.
+        """
+        host = urlparse(url).netloc
+        breaker = self.breakers.setdefault(host, CircuitBreaker())
+        self.retry_budget.record_request()
+        
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise UpstreamUnavailable(f"Circuit open for {host}")
+            
+            started = time.monotonic()
+            try:
+                timeout = aiohttp.ClientTimeout(total=breaker.timeout())
+                async with self.session.get(url, headers=headers, timeout=timeout) as response:
+                    if response.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+                    result = await handler(response)
+                breaker.record_success(time.monotonic() - started)
+                return result
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                if attempt >= SCRAPER_MAX_RETRIES or not self.retry_budget.try_spend():
+                    raise UpstreamUnavailable(f"{host}: {type(e).__name__} {e}") from e
+                attempt += 1
+                await asyncio.sleep(0.1 * 2 ** attempt)
+            except BaseException:
+                # Cancelled by a deadline or failed in the handler: neither proves the host up or down
+                breaker.release()
+                raise
+    
+    def _store(self, cache: OrderedDict, key: Any, entry: Dict[str, Any],
+               response: aiohttp.ClientResponse) -> None:
+        """Cache an entry with the response's validators, evicting the least recently used"""
+        entry.update({
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.monotonic()
+        })
+        cache[key] = entry
+        cache.move_to_end(key)
+        while len(cache) > SCRAPER_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+    
+    async def _conditional_get(self, url: str, source: str, entry: Optional[Dict[str, Any]], field: str,
+                            read: Callable[[aiohttp.ClientResponse], Awaitable[Any]]) -> Any:
+        """
+        Request a page, revalidating a cached entry when there is one
+        `read` turns a 200 response into the result, otherwise the entry's `field` is kept.
+        """
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        
+        async def handle(response: aiohttp.ClientResponse) -> Any:
+            if response.status == 304 and entry is not None:
+                entry['fetched_at'] = time.monotonic()
+                return entry[field]
+            
+            if response.status != 200:
+                logger.warning("Failed to fetch %s (%s): %s", source, url, response.status)
+                # A stale copy is more useful than nothing
+                return entry[field] if entry is not None else None
+            
+            return await read(response)
+        
+        try:
+            return await self.request(url, handle, headers)
+        except UpstreamUnavailable as e:
+            if entry is None:
+                raise
+            logger.warning("Serving cached %s page: %s", source, e)
+            return entry[field]
+    
+    async def _fetch_upstream(self, url: str, source: str, entry: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Request a whole page into the response cache"""
+        
+        async def read(response: aiohttp.ClientResponse) -> str:
+            body = await response.text()
+            self._store(self.cache, url, {'body': body}, response)
+            return body
+        
+        body = await self._conditional_get(url, source, entry, 'body', read)
+        if url in self.cache:
+            self.cache.move_to_end(url)
+        return body
+    
+    async def _stream_upstream(self, url: str, source: str, accept: Callable[[str, str], bool], limit: int,
+                               entry: Optional[Dict[str, Any]]) -> Optional[List[Tuple[str, str]]]:
+        """
+        Request a page and extract links from its chunks on the stream pool as they arrive
+        Reading stops once `limit` links are accepted, leaving the rest of the body unread.
+        """
+        key = (url, accept, limit)
+        
+        async def read(response: aiohttp.ClientResponse) -> List[Tuple[str, str]]:
+            extractor = LinkExtractor(accept, limit)
+            decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+            async for chunk in response.content.iter_chunked(SCRAPER_STREAM_CHUNK_SIZE):
+                await self.parse(extractor.feed, decoder.decode(chunk), pool=self.stream_pool)
+                if extractor.done:
+                    break
+            else:
+                await self.parse(extractor.finish, decoder.decode(b'', final=True), pool=self.stream_pool)
+            self._store(self.link_cache, key, {'links': extractor.links}, response)
+            return extractor.links
+        
+        links = await self._conditional_get(url, source, entry, 'links', read)
+        if key in self.link_cache:
+            self.link_cache.move_to_end(key)
+        return links
+    
+    async def stream_links(self, url: str, source: str, accept: Callable[[str, str], bool],
+                           limit: int) -> Optional[List[Tuple[str, str]]]:
+        """
+        Extract the first `limit` accepted links from a page while it downloads
+        Returns as soon as enough links are found without reading the rest of the page.
+        The links are cached and revalidated like page bodies, concurrent streams of one
+        page share a request, and a fresh or in-flight whole-page fetch is used instead.
+        """
+        key = (url, accept, limit)
+        entry = self.link_cache.get(key)
+        if entry is not None and time.monotonic() - entry['fetched_at'] < SCRAPER_CACHE_TTLS.get(source, 300):
+            self.link_cache.move_to_end(key)
+            return entry['links']
+        
+        page = self.cache.get(url)
+        if url in self._inflight or (page is not None and
+                                     time.monotonic() - page['fetched_at'] < SCRAPER_CACHE_TTLS.get(source, 300)):
+            html = await self.fetch(url, source)
+            return await self.parse(extract_links, html, accept, limit) if html is not None else None
+        
+        inflight = self._inflight.get(key) or self._share(key, self._stream_upstream(url, source, accept, limit, entry))
+        return await asyncio.shield(inflight)
     
     async def get_latest_news(self, limit: int = 5) -> List[Dict]:
         """Get latest UN news articles"""
         try:
-            async with self.session.get(self.base_urls['news']) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    news_items = []
-                    # Look for news article links
-                    article_links = soup.find_all('a', href=True)
-                    
-                    for link in article_links[:limit]:
-                        href = link.get('href', '')
-                        title = link.get_text(strip=True)
-                        
-                        if title and len(title) > 10 and 'un.org' in href:
-                            news_items.append({
-                                'title': title,
-                                'url': href if href.startswith('http') else f"https://news.un.org{href}",
-                                'source': 'UN News'
-                            })
-                    
-                    return news_items
-                else:
-                    logger.warning(f"Failed to fetch UN news: {response.status}")
-                    return []
+            if SCRAPER_STREAMING:
+                links = await self.stream_links(self.base_urls['news'], 'news', is_news_link, limit)
+                return [news_item(href, title) for href, title in links or []]
+            
+            html = await self.fetch(self.base_urls['news'], 'news')
+            if html is None:
+                return []
+            
+            return await self.parse(extract_news, html, limit)
         except Exception as e:
-            logger.error(f"Error fetching UN news: {e}")
+            logger.error("Error fetching UN news: %s", e)
             return []
     
     async def get_security_council_updates(self) -> List[Dict]:
         """Get latest Security Council updates"""
         try:
-            async with self.session.get(self.base_urls['security_council']) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    updates = []
-                    # Look for meeting information
-                    meeting_links = soup.find_all('a', href=True)
-                    
-                    for link in meeting_links[:3]:
-                        href = link.get('href', '')
-                        title = link.get_text(strip=True)
-                        
-                        if 'meeting' in title.lower() or 'session' in title.lower():
-                            updates.append({
-                                'title': title,
-                                'url': href if href.startswith('http') else f"https://www.un.org{href}",
-                                'source': 'Security Council'
-                            })
-                    
-                    return updates
-                else:
-                    logger.warning(f"Failed to fetch Security Council updates: {response.status}")
-                    return []
+            if SCRAPER_STREAMING:
+                links = await self.stream_links(self.base_urls['security_council'], 'security_council',
+                                                is_meeting_link, 3)
+                return [meeting_item(href, title) for href, title in links or []]
+            
+            html = await self.fetch(self.base_urls['security_council'], 'security_council')
+            if html is None:
+                return []
+            
+            return await self.parse(extract_security_council_updates, html)
         except Exception as e:
-            logger.error(f"Error fetching Security Council updates: {e}")
+            logger.error("Error fetching Security Council updates: %s", e)
             return []
     
+    async def get_source_updates(self, source: str, limit: int = 3) -> List[Dict]:
+        """Get the latest linked updates from one of the SOURCE_LINKS sources"""
+        accept, build = SOURCE_LINKS[source]
+        url = self.base_urls[source]
+        if SCRAPER_STREAMING:
+            links = await self.stream_links(url, source, accept, limit)
+        else:
+            html = await self.fetch(url, source)
+            links = await self.parse(extract_links, html, accept, limit) if html is not None else None
+        return [build(href, title) for href, title in links or []]
+    
+    async def get_latest_updates(self, limit: int = 10, per_source: int = 3,
+                                 sources: Optional[List[str]] = None,
+                                 deadlines: Optional[Dict[str, float]] = None) -> Tuple[List[Dict], List[str]]:
+        """
+        Fetch every update source (or just `sources`) concurrently and merge the results
+        Each source gets its own deadline from `deadlines` (SCRAPER_SOURCE_DEADLINES by default,
+        sized for interactions), so a slow or failing source only drops its own items.
+        Returns: (up to `limit` deduplicated items interleaved across sources, sources that failed)
+        """
+        slots = asyncio.Semaphore(SCRAPER_AGGREGATE_CONCURRENCY)
+        
+        async def bounded(source: str) -> List[Dict]:
+            async with slots:
+                return await self.get_source_updates(source, per_source)
+        
+        sources = list(sources or SOURCE_LINKS)
+        deadlines = SCRAPER_SOURCE_DEADLINES if deadlines is None else deadlines
+        results = await asyncio.gather(
+            *(asyncio.wait_for(bounded(source), deadlines.get(source, 2.0)) for source in sources),
+            return_exceptions=True
+        )
+        
+        per_source_items = []
+        missing = []
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                logger.warning("Skipping %s in latest updates: %s %s", source, type(result).__name__, result)
+                missing.append(source)
+            else:
+                per_source_items.append(result)
+        
+        # Round-robin across sources so one busy page cannot crowd out the others
+        merged = []
+        seen = set()
+        for rank in range(per_source):
+            for items in per_source_items:
+                if rank < len(items):
+                    key = dedupe_key(items[rank])
+                    if key not in seen:
+                        seen.add(key)
+                        merged.append(items[rank])
+        
+        return merged[:limit], missing
+    
     async def search_resolution(self, resolution_type: str, number: int) -> Optional[Dict]:
         """Search for specific UN resolution"""
         try:
-            if resolution_type.lower() == 'sc':
-                search_url = f"https://digitallibrary.un.org/search?ln=en&p=resolution+{number}"
-            else:
-                search_url = f"https://digitallibrary.un.org/search?ln=en&p=resolution+{number}"
+            prefix = 'S' if resolution_type.lower() == 'sc' else 'A'
+            search_url = f"https://digitallibrary.un.org/search?ln=en&p={quote_plus(f'{prefix}/RES/{number}')}"
+            
+            html = await self.fetch(search_url, 'digital_library')
+            if html is None:
+                return None
             
-            async with self.session.get(search_url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Look for resolution links
-                    resolution_links = soup.find_all('a', href=True)
-                    
-                    for link in resolution_links:
-                        href = link.get('href', '')
-                        title = link.get_text(strip=True)
-                        
-                        if str(number) in title and ('resolution' in title.lower() or 'res' in title.lower()):
-                            return {
-                                'title': title,
-                                'url': href if href.startswith('http') else f"https://digitallibrary.un.org{href}",
-                                'type': resolution_type.upper(),
-                                'number': number
-                            }
-                    
-                    return None
-                else:
-                    logger.warning(f"Failed to search resolution: {response.status}")
-                    return None
+            return await self.parse(extract_resolution, html, resolution_type, number)
         except Exception as e:
-            logger.error(f"Error searching resolution: {e}")
+            logger.error("Error searching resolution: %s", e)
             return None
     
-    async def get_charter_article_online(self, article_number: int) -> Optional[Dict]:
-        """Get UN Charter article from official website"""
+    async def ingest_resolutions(self, body: str, period: int) -> List[Dict]:
+        """Fetch and parse one resolution listing, a year for 'SC' or a session for 'GA'"""
         try:
-            async with self.session.get(self.base_urls['charter']) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Look for article content
-                    article_pattern = re.compile(rf'article\s*{article_number}', re.IGNORECASE)
-                    article_elements = soup.find_all(text=article_pattern)
-                    
-                    for element in article_elements:
-                        parent = element.parent
-                        if parent:
-                            title = parent.get_text(strip=True)
-                            content = parent.get_text(strip=True)
-                            
-                            if len(content) > 50:  # Ensure substantial content
-                                return {
-                                    'title': title,
-                                    'content': content,
-                                    'url': self.base_urls['charter'],
-                                    'article_number': article_number
-                                }
-                    
-                    return None
-                else:
-                    logger.warning(f"Failed to fetch charter article: {response.status}")
-                    return None
+            url = self.resolution_urls[body].format(period=period)
+            html = await self.fetch(url, 'resolutions')
+            if html is None:
+                return []
+            
+            return await self.parse(extract_resolution_listing, html, body, url)
         except Exception as e:
-            logger.error(f"Error fetching charter article: {e}")
+            logger.error("Error ingesting %s resolutions for %s: %s", body, period, e)
+            return []
+    
+    async def ingest_charter(self) -> Dict[str, Dict[str, str]]:
+        """
+        Fetch and parse the official Charter into {article number: {'title', 'content'}}
+        The page is only re-parsed when the fetched body changes.
+        """
+        try:
+            html = await self.fetch(self.base_urls['charter'], 'charter')
+            if html is None:
+                return self._charter_articles
+            
+            if html is not self._charter_body:
+                self._charter_articles = await self.parse(parse_charter, html)
+                self._charter_body = html
+                logger.info("Parsed %s Charter articles", len(self._charter_articles))
+            
+            return self._charter_articles
+        except Exception as e:
+            logger.error("Error ingesting charter: %s", e)
+            return self._charter_articles
+    
+    async def get_charter_article_online(self, article_number: int) -> Optional[Dict]:
+        """Get UN Charter article from official website"""
+        articles = await self.ingest_charter()
+        article = articles.get(str(article_number))
+        if article is None:
             return None
+        
+        return {
+            'title': article['title'],
+            'content': article['content'],
+            'url': self.base_urls['charter'],
+            'article_number': article_number
+        }
     
     async def get_policy_definition_online(self, term: str) -> Optional[Dict]:
         """Search for policy definition on UN websites"""
@@ -176,32 +825,13 @@ class UNScraper:
             # Search UN documentation
             search_url = f"https://digitallibrary.un.org/search?ln=en&p={term}"
             
-            async with self.session.get(search_url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Look for relevant documents
-                    doc_links = soup.find_all('a', href=True)
-                    
-                    for link in doc_links[:3]:
-                        href = link.get('href', '')
-                        title = link.get_text(strip=True)
-                        
-                        if term.lower() in title.lower() and len(title) > 10:
-                            return {
-                                'title': title,
-                                'url': href if href.startswith('http') else f"https://digitallibrary.un.org{href}",
-                                'term': term,
-                                'source': 'UN Digital Library'
-                            }
-                    
-                    return None
-                else:
-                    logger.warning(f"Failed to search policy definition: {response.status}")
-                    return None
+            html = await self.fetch(search_url, 'digital_library')
+            if html is None:
+                return None
+            
+            return await self.parse(extract_policy_definition, html, term)
         except Exception as e:
-            logger.error(f"Error searching policy definition: {e}")
+            logger.error("Error searching policy definition: %s", e)
             return None
 
 # Example usage function
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the DataManager, RateLimiter and utils hot paths
+
+Synthetic corpora are built from the shipped JSON scaled up 10x, 100x and 1000x,
+so index and lookup costs can be tracked as the data grows. Results are saved as
+JSON baselines and later runs can be compared against them.
+
+Usage:
+    python tests/benchmarks.py --save baseline.json
+    python tests/benchmarks.py --compare baseline.json --fail-on-regression
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.commands import UNBotCommands
+from src.config import CHARTER_FILE, POLICY_FILE
+from src.data_manager import DataManager, build_snapshot
+from src.rate_limiter import RateLimiter
+from src.utils import sanitize_input, create_embed, split_content
+
+DEFAULT_SCALES = [10, 100, 1000]
+# Seconds spent timing each benchmark, split over the repeats
+DEFAULT_BUDGET = 0.5
+REPEATS = 5
+# Slowdown (percent) reported as a regression by --compare
+DEFAULT_THRESHOLD = 10.0
+# Synthetic words added per document, drawn from a vocabulary that grows with the scale
+FILLER_WORDS = 40
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def scale_corpus(charter: Dict[str, Any], policies: Dict[str, Any],
+                 scale: int, seed: int = 0) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Replicate the shipped data `scale` times with distinct keys and a growing vocabulary"""
+    rng = random.Random(seed)
+    vocabulary = [f"lexeme{n}" for n in range(200 * scale)]
+    
+    def filler() -> str:
+        return ' '.join(rng.choice(vocabulary) for _ in range(FILLER_WORDS))
+    
+    scaled_charter = {}
+    articles = list(charter.values())
+    for number in range(1, len(articles) * scale + 1):
+        article = articles[(number - 1) % len(articles)]
+        scaled_charter[str(number)] = {
+            'title': article['title'],
+            'content': f"{article['content']}\n\n{filler()}"
+        }
+    
+    scaled_policies = {}
+    for copy in range(scale):
+        suffix = f" {copy}" if copy else ''
+        for key, policy in policies.items():
+            scaled_policies[f"{key}{suffix.replace(' ', '_')}"] = {
+                **policy,
+                'title': f"{policy['title']}{suffix}",
+                'description': f"{policy['description']} {filler()}",
+                'aliases': [f"{alias}{suffix}" for alias in policy.get('aliases', [])]
+            }
+    return scaled_charter, scaled_policies
+
+def data_manager_for(charter: Dict[str, Any], policies: Dict[str, Any]) -> DataManager:
+    """DataManager serving a synthetic corpus instead of the data files"""
+    data = DataManager()
+    data._swap(build_snapshot(charter, policies, {}), data.file_stamps)
+    return data
+
+def measure(func: Callable[[], Any], budget: float) -> Dict[str, float]:
+    """Time func, calibrating the loop count so each repeat takes about budget / REPEATS"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= budget / REPEATS / 10 or number >= 1_000_000:
+            break
+        number *= 10
+    number = max(1, int(number * (budget / REPEATS) / max(elapsed, 1e-9)))
+    
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return {
+        'median_us': round(statistics.median(timings) * 1e6, 3),
+        'min_us': round(min(timings) * 1e6, 3),
+        'loops': number
+    }
+
+def cycle(values: List[Any]) -> Callable[[], Any]:
+    """Return a function handing out values round-robin"""
+    state = {'index': -1}
+    
+    def next_value() -> Any:
+        state['index'] = (state['index'] + 1) % len(values)
+        return values[state['index']]
+    return next_value
+
+def data_benchmarks(scale: int, charter: Dict[str, Any], policies: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """Benchmarks whose cost depends on the corpus size"""
+    scaled_charter, scaled_policies = scale_corpus(charter, policies, scale)
+    data = data_manager_for(scaled_charter, scaled_policies)
+    queries = cycle(['peace', 'security council', 'human rights', 'self-defense', 'lexeme7', 'nonexistent'])
+    terms = cycle(list(scaled_policies)[::max(1, len(scaled_policies) // 50)] + ['Responsibility to Protect', 'unknown'])
+    misspelled = cycle(['responsability to protect', 'peacekeping', 'humanitarian asistance', 'sovereignity',
+                        'climate chnage', 'qzxv'])
+    
+    limiter = RateLimiter(max_entries=100 * scale)
+    # (user, command, guild) arguments built up front so only the check itself is timed
+    commands = ['charter', 'policy', 'search', 'latest']
+    hits = cycle([(user_id, commands[user_id % len(commands)], user_id % 50) for user_id in range(100 * scale)])
+    
+    content = cycle([article['content'] * max(1, scale // 10) for article in charter.values()])
+    return {
+        'search_charter': lambda: data.search_charter(queries()),
+        'search_charter_substring': lambda: data.search_charter(queries(), mode='substring'),
+        'search': lambda: data.search(queries()),
+        'get_policy_term': lambda: data.get_policy_term(terms()),
+        'suggest_policy_terms': lambda: data.suggest_policy_terms(misspelled()),
+        'is_rate_limited': lambda: limiter.is_rate_limited(*hits()),
+        'split_content': lambda: split_content(content())
+    }
+
+def util_benchmarks(charter: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """Benchmarks independent of the corpus size"""
+    inputs = cycle(['responsibility to protect', '<@123> peace & security #general', 'x' * 500, ''])
+    article = next(iter(charter.values()))
+    fields = [{'name': f"Field {i}", 'value': article['content'][:1024], 'inline': False} for i in range(5)]
+    
+    # A render cache hit should stay cheaper than building the embed it serves
+    commands = UNBotCommands(DataManager(), RateLimiter())
+    number = next(iter(charter))
+    build = lambda: commands._build_charter_embed(int(number), charter[number])
+    commands.render_embed('charter', number, build)
+    return {
+        'sanitize_input': lambda: sanitize_input(inputs()),
+        'create_embed': lambda: create_embed(article['title'], article['content'], fields=fields,
+                                             footer="United Nations Charter", url="https://www.un.org/"),
+        'render_embed_build': build,
+        'render_embed_hit': lambda: commands.render_embed('charter', number, build)
+    }
+
+def run_benchmarks(scales: List[int], budget: float = DEFAULT_BUDGET,
+                   only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run every benchmark at every scale, returns the results document"""
+    charter, policies = load_json(CHARTER_FILE), load_json(POLICY_FILE)
+    results = {}
+    
+    suites = [('1x', util_benchmarks(charter))] + [
+        (f"{scale}x", data_benchmarks(scale, charter, policies)) for scale in scales
+    ]
+    for label, benchmarks in suites:
+        for name, func in benchmarks.items():
+            if only and name not in only:
+                continue
+            key = f"{name}[{label}]"
+            results[key] = measure(func, budget)
+            print(f"  {key:<36}{results[key]['median_us']:>12.3f} µs")
+    
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scales': scales
+        },
+        'results': results
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[str, float, float, float]]:
+    """Print the change of each benchmark against a baseline, returns the regressions"""
+    regressions = []
+    print(f"{'Benchmark':<36}{'Baseline µs':>14}{'Current µs':>14}{'Change':>10}")
+    for key, result in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None:
+            print(f"{key:<36}{'-':>14}{result['median_us']:>14.3f}{'new':>10}")
+            continue
+        change = (result['median_us'] - before['median_us']) / before['median_us'] * 100 if before['median_us'] else 0.0
+        flag = ' ❌' if change > threshold else (' ✅' if change < -threshold else '')
+        print(f"{key:<36}{before['median_us']:>14.3f}{result['median_us']:>14.3f}{change:>+9.1f}%{flag}")
+        if change > threshold:
+            regressions.append((key, before['median_us'], result['median_us'], change))
+    return regressions
+
+def main():
+    """Run the benchmarks from the command line"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for DataManager, RateLimiter and utils")
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help='corpus multipliers of the shipped data (default: 10,100,1000)')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help='seconds of timing per benchmark (default: 0.5)')
+    parser.add_argument('--only', help='comma-separated benchmark names to run')
+    parser.add_argument('--save', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', help='compare against a saved JSON baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='percent slowdown counted as a regression (default: 10)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='exit non-zero when --compare finds a regression')
+    args = parser.parse_args()
+    
+    # Keep index-building log lines out of the timings
+    logging.disable(logging.INFO)
+    
+    print("⏱️  Running UN Bot micro-benchmarks...")
+    current = run_benchmarks([int(scale) for scale in args.scales.split(',')], args.budget,
+                             args.only.split(',') if args.only else None)
+    
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"💾 Baseline written to {args.save}")
+    
+    if args.compare:
+        print()
+        regressions = compare(current, load_json(args.compare), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold}%")
+            if args.fail_on_regression:
+                sys.exit(1)
+        else:
+            print("✅ No regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
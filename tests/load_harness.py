@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Load-test harness driving UNBotCommands with synthetic interactions
+
+Dispatches interactions at a fixed rate with a weighted command mix through
+UNBotCommands.run, the same path slash commands take in bot.py, and reports
+throughput, response latency percentiles and event-loop lag.
+
+Usage: python tests/load_harness.py --rate 500 --duration 10 --mix charter=3,policy=3,search=3,help=1
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import RATE_LIMIT_POLICIES
+from src.data_manager import DataManager
+from src.rate_limiter import RateLimiter
+from src.commands import UNBotCommands
+from src.feed_scheduler import FeedScheduler, FeedSnapshot
+
+DEFAULT_MIX = 'charter=3,policy=3,search=3,resolution=1,latest=1,help=1'
+SEARCH_QUERIES = ['peace', 'security council', 'human rights', 'self-defense', 'climate', 'refugees']
+# Interval of the event-loop lag probe (seconds)
+LAG_PROBE_INTERVAL = 0.01
+# Reply UNBotCommands.run sends when a handler raises
+HANDLER_ERROR = "❌ Handler error"
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.name = f"load-user-{user_id}"
+
+class FakeResponse:
+    """Stands in for discord.InteractionResponse, timing the acknowledgment"""
+    
+    def __init__(self, interaction: 'FakeInteraction'):
+        self.interaction = interaction
+        self._done = False
+    
+    def is_done(self) -> bool:
+        return self._done
+    
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self._acknowledge()
+        self.interaction.replies.append((content, kwargs))
+    
+    async def defer(self, **kwargs: Any) -> None:
+        self._acknowledge()
+        self.interaction.deferred = True
+    
+    def _acknowledge(self) -> None:
+        if self._done:
+            raise RuntimeError("Interaction has already been responded to")
+        self._done = True
+        self.interaction.acknowledged_at = time.perf_counter()
+
+class FakeFollowup:
+    def __init__(self, interaction: 'FakeInteraction'):
+        self.interaction = interaction
+    
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self.interaction.replies.append((content, kwargs))
+
+class FakeInteraction:
+    """Minimal discord.Interaction with the attributes UNBotCommands reads"""
+    
+    def __init__(self, interaction_id: int, user_id: int, guild_id: Optional[int]):
+        self.id = interaction_id
+        self.user = FakeUser(user_id)
+        self.guild_id = guild_id
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.replies: List[Tuple[Optional[str], Dict[str, Any]]] = []
+        self.deferred = False
+        self.acknowledged_at: Optional[float] = None
+    
+    async def delete_original_response(self) -> None:
+        pass
+    
+    @property
+    def rate_limited(self) -> bool:
+        return bool(self.replies) and (self.replies[0][0] or '').startswith('⏳')
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse 'charter=3,search=1' into command weights"""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def command_args(data: DataManager, command: str, rng: random.Random) -> Tuple[Any, ...]:
+    """Pick arguments for a command, mostly valid with some misses"""
+    if command == 'charter':
+        return (rng.choice(data.get_available_articles() + [999]),)
+    if command == 'policy':
+        return (rng.choice(data.get_available_terms() + ['not a term']),)
+    if command == 'search':
+        return (rng.choice(SEARCH_QUERIES),)
+    if command == 'resolution':
+        return (rng.choice(['sc', 'ga']), rng.randint(1, 2800))
+    return ()
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/max in milliseconds"""
+    return {
+        name: (round(value * 1000, 3) if value is not None else None)
+        for name, value in (('p50', percentile(values, 50)), ('p95', percentile(values, 95)),
+                            ('p99', percentile(values, 99)), ('max', max(values) if values else None))
+    }
+
+async def probe_lag(samples: List[float], stop: asyncio.Event) -> None:
+    """Measure how late the event loop wakes a sleeping task"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - started - LAG_PROBE_INTERVAL))
+
+def build_commands(user_limits_only: bool = False) -> UNBotCommands:
+    """UNBotCommands over the shipped data, with /latest served from a prefilled feed snapshot"""
+    data = DataManager()
+    # The global bucket caps the whole bot, so without dropping it most load is rejected up front
+    policies = None
+    if user_limits_only:
+        policies = {key: spec for key, spec in RATE_LIMIT_POLICIES.items() if key[0] == 'user'}
+    feeds = FeedScheduler(scraper=None)
+    feeds.snapshot = FeedSnapshot(
+        items=tuple({'title': f"Load test headline {i}", 'url': f"https://news.un.org/{i}", 'source': 'UN News'}
+                    for i in range(5)),
+        missing=(),
+        updated_at=time.time()
+    )
+    return UNBotCommands(data, RateLimiter(policies=policies), feeds=feeds)
+
+async def run_load(rate: float, duration: float, mix: Dict[str, float], users: int = 1000,
+                   guilds: int = 50, seed: int = 0,
+                   commands: Optional[UNBotCommands] = None) -> Dict[str, Any]:
+    """Drive commands at `rate` interactions per second for `duration` seconds and report"""
+    commands = commands or build_commands()
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    handlers = {name: getattr(commands, 'help_command' if name == 'help' else name) for name in names}
+    ids = itertools.count(1)
+    
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    completions: List[float] = []
+    counts = {'sent': 0, 'rate_limited': 0, 'deferred': 0, 'errors': 0}
+    
+    async def dispatch(command: str) -> None:
+        interaction = FakeInteraction(next(ids), rng.randint(1, users), rng.randint(1, guilds))
+        args = command_args(commands.data, command, rng)
+        started = time.perf_counter()
+        try:
+            await commands.run(interaction, handlers[command], *args, error=HANDLER_ERROR)
+        except Exception:
+            counts['errors'] += 1
+            return
+        finished = time.perf_counter()
+        if interaction.acknowledged_at is None or (HANDLER_ERROR, {'ephemeral': True}) in interaction.replies:
+            counts['errors'] += 1
+            return
+        latencies[command].append(interaction.acknowledged_at - started)
+        completions.append(finished - started)
+        counts['rate_limited'] += interaction.rate_limited
+        counts['deferred'] += interaction.deferred
+    
+    lag: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(lag, stop))
+    tasks = set()
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    total = int(rate * duration)
+    while counts['sent'] < total:
+        # Open-loop arrivals: catch up on everything due by now, however slow handlers are
+        due = min(total, int((loop.time() - started) * rate) + 1)
+        while counts['sent'] < due:
+            task = asyncio.create_task(dispatch(rng.choices(names, weights)[0]))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            counts['sent'] += 1
+        await asyncio.sleep(min(0.005, 1 / rate))
+    if tasks:
+        await asyncio.gather(*tasks)
+    elapsed = loop.time() - started
+    stop.set()
+    await probe
+    
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'rate': rate,
+        'duration': round(elapsed, 3),
+        'mix': mix,
+        **counts,
+        'throughput': round(len(completions) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': summarize(all_latencies),
+        'completion_ms': summarize(completions),
+        'per_command_ms': {name: summarize(values) for name, values in latencies.items()},
+        'loop_lag_ms': summarize(lag)
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a report in the same register as the test runner"""
+    print("📊 UN Bot load test")
+    print("=" * 50)
+    print(f"Offered rate:   {report['rate']:.0f}/s for {report['duration']:.1f}s")
+    print(f"Throughput:     {report['throughput']:.1f} interactions/s")
+    print(f"Sent:           {report['sent']} (rate limited {report['rate_limited']}, "
+          f"deferred {report['deferred']}, errors {report['errors']})")
+    for label, key in (('Ack latency', 'latency_ms'), ('Completion', 'completion_ms'), ('Loop lag', 'loop_lag_ms')):
+        stats = report[key]
+        print(f"{label + ':':<16}p50 {stats['p50']}ms  p95 {stats['p95']}ms  p99 {stats['p99']}ms  max {stats['max']}ms")
+    print("Per command (ack p50 / p99 ms):")
+    for name, stats in report['per_command_ms'].items():
+        print(f"  {name:<12}{stats['p50']} / {stats['p99']}")
+
+def main():
+    """Run the load test from the command line"""
+    parser = argparse.ArgumentParser(description="Drive UNBotCommands with synthetic interactions")
+    parser.add_argument('--rate', type=float, default=200, help='interactions per second (default: 200)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds to generate load (default: 10)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'weighted command mix (default: {DEFAULT_MIX})')
+    parser.add_argument('--users', type=int, default=1000, help='distinct user ids (fewer means more rate limiting)')
+    parser.add_argument('--guilds', type=int, default=50, help='distinct guild ids')
+    parser.add_argument('--user-limits-only', action='store_true',
+                        help='drop guild and global rate limits so most interactions reach the handlers')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for a reproducible run')
+    parser.add_argument('--json', help='also write the report to this file')
+    parser.add_argument('--max-p99', type=float, help='exit non-zero if ack p99 latency exceeds this many ms')
+    args = parser.parse_args()
+    
+    # Per-interaction log lines would dominate the measurement
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run_load(args.rate, args.duration, parse_mix(args.mix), args.users, args.guilds,
+                                  args.seed, build_commands(args.user_limits_only)))
+    print_report(report)
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.json}")
+    
+    p99 = report['latency_ms']['p99']
+    if args.max_p99 is not None and (p99 is None or p99 > args.max_p99):
+        print(f"❌ p99 latency {p99}ms exceeds {args.max_p99}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
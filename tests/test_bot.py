@@ -4,6 +4,8 @@ import json
 import os
 import sys
 import asyncio
+import concurrent.futures
+import threading
 from unittest.mock import Mock, AsyncMock
 import discord
 
@@ -11,6 +13,11 @@ import discord
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+def run_coroutine(coro):
+    """Run a coroutine from a sync test, even while the suite runner's event loop is running"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 def test_data_integrity():
     """Test data files integrity and content"""
     print("🔍 Testing data integrity...")
@@ -80,6 +87,14 @@ def test_data_manager():
             print("❌ Policy term R2P not found")
             return False
         
+        # Test normalized alias lookup
+        alias_policy = dm.get_policy_term('  Responsibility  to PROTECT ')
+        if alias_policy is policy:
+            print("✅ Normalized alias lookup works")
+        else:
+            print("❌ Normalized alias lookup failed")
+            return False
+        
         # Test search functionality
         charter_results = dm.search_charter('peace')
         print(f"✅ Charter search results: {len(charter_results)}")
@@ -92,6 +107,246 @@ def test_data_manager():
         print(f"❌ DataManager error: {e}")
         return False
 
+def test_search_index():
+    """Test inverted index search against the substring fallback"""
+    print("🔍 Testing search index...")
+    
+    try:
+        from src.data_manager import DataManager
+        dm = DataManager()
+        
+        # Token lookups must be a subset of the substring scan
+        indexed = {r['number'] for r in dm.search_charter('security council')}
+        scanned = {r['number'] for r in dm.search_charter('security council', mode='substring')}
+        if indexed and indexed <= scanned:
+            print(f"✅ Indexed charter search: {len(indexed)} results")
+        else:
+            print(f"❌ Indexed charter search mismatch: {indexed} vs {scanned}")
+            return False
+        
+        # Partial words have no postings and match the indexed words they start
+        partial = [r['number'] for r in dm.search_charter('defen')]
+        if '51' in partial and dm.search('peacekeep')[0] > 0:
+            print("✅ Partial words match the words they start")
+        else:
+            print(f"❌ Partial word search returned {partial}")
+            return False
+        
+        # Misses stay index lookups instead of scanning the corpus
+        dm._substring_charter_matches = dm._substring_policy_matches = Mock(side_effect=AssertionError)
+        if dm.search('zzqxv')[0] == 0 and not dm.search_charter('zzqxv') and dm.search_policy('secur'):
+            print("✅ Missed queries answered from the index without a corpus scan")
+        else:
+            print("❌ Unexpected results for a missed or partial query")
+            return False
+        del dm._substring_charter_matches, dm._substring_policy_matches
+        
+        # Aliases are indexed for policy terms
+        if any(r['term'] == 'r2p' for r in dm.search_policy('responsibility protect')):
+            print("✅ Policy alias search works")
+        else:
+            print("❌ Policy alias search failed")
+            return False
+        
+        # Ranked search returns the best matches first, bounded by limit
+        total, top = dm.search('security council', limit=2)
+        scores = [r['score'] for r in top]
+        if len(top) == 2 and total >= 2 and scores == sorted(scores, reverse=True):
+            print(f"✅ Ranked search: top {len(top)} of {total}")
+        else:
+            print(f"❌ Ranked search failed: {total} total, scores {scores}")
+            return False
+        
+        # Fuzzy suggestions resolve typos
+        if dm.suggest_policy_terms('peacekeepin')[:1] == ['peacekeeping']:
+            print("✅ Fuzzy policy suggestions work")
+        else:
+            print("❌ Fuzzy policy suggestions failed")
+            return False
+        
+        if dm.search_charter('') == [] and dm.search_charter('zzzzzz') == []:
+            print("✅ Empty and unknown queries return no results")
+        else:
+            print("❌ Empty or unknown query returned results")
+            return False
+        
+        return True
+    except Exception as e:
+        print(f"❌ Search index error: {e}")
+        return False
+
+def test_rate_limiter():
+    """Test rate limiter cooldowns and bounded memory"""
+    print("🔍 Testing rate limiter...")
+    
+    try:
+        from src.rate_limiter import RateLimiter
+        rl = RateLimiter(max_entries=100)
+        
+        limited, _ = rl.is_rate_limited(1, 'latest')
+        limited_again, remaining = rl.is_rate_limited(1, 'latest')
+        if not limited and limited_again and remaining > 0:
+            print(f"✅ Cooldown enforced: {remaining:.1f}s remaining")
+        else:
+            print("❌ Cooldown not enforced")
+            return False
+        
+        for user_id in range(1000):
+            rl.is_rate_limited(user_id, 'search')
+        if len(rl) <= 100:
+            print(f"✅ Rate limiter memory bounded: {len(rl)} entries")
+        else:
+            print(f"❌ Rate limiter grew to {len(rl)} entries")
+            return False
+        
+        # Token bucket absorbs a burst, sliding window caps a guild
+        rl = RateLimiter(policies={
+            ('user', 'charter'): {'type': 'token_bucket', 'rate': 0.2, 'capacity': 3},
+            ('guild', '*'): {'type': 'sliding_window', 'limit': 4, 'window': 10}
+        })
+        burst = [rl.is_rate_limited(1, 'charter', guild_id=7)[0] for _ in range(4)]
+        if burst == [False, False, False, True]:
+            print("✅ Token bucket allows a burst of 3")
+        else:
+            print(f"❌ Token bucket burst results: {burst}")
+            return False
+        
+        guild_hits = [rl.is_rate_limited(user_id, 'search', guild_id=7)[0] for user_id in range(2, 4)]
+        if guild_hits == [False, True]:
+            print("✅ Guild sliding window enforced")
+        else:
+            print(f"❌ Guild sliding window results: {guild_hits}")
+            return False
+        
+        return True
+    except Exception as e:
+        print(f"❌ Rate limiter error: {e}")
+        return False
+
+class FakeRESPConnection:
+    """In-process stand-in for a Redis server, supporting the commands RedisStore uses"""
+    
+    def __init__(self):
+        self.data = {}
+        self.queue = None
+    
+    def _run(self, command):
+        from src.rate_limiter import RedisError
+        name, args = command[0], command[1:]
+        if name in ('EVAL', 'EVALSHA'):
+            return RedisError(f"Redis error: ERR unknown command '{name}'")
+        if name == 'MGET':
+            return [self.data.get(key) for key in args]
+        if name == 'GET':
+            return self.data.get(args[0])
+        if name == 'SET':
+            self.data[args[0]] = args[1]
+            return 'OK'
+        return 'OK'
+    
+    def pipeline(self, *commands, raise_errors=True):
+        replies = []
+        for command in commands:
+            if command[0] == 'MULTI':
+                self.queue = []
+                replies.append('OK')
+            elif command[0] == 'EXEC':
+                replies.append([self._run(queued) for queued in self.queue])
+                self.queue = None
+            elif self.queue is not None:
+                self.queue.append(command)
+                replies.append('QUEUED')
+            else:
+                replies.append(self._run(command))
+        errors = [reply for reply in replies if isinstance(reply, Exception)]
+        if raise_errors and errors:
+            raise errors[0]
+        return replies
+    
+    def close(self):
+        pass
+
+async def _concurrent_checks(limiter, user_ids):
+    """Check a hit for every user at once from the event loop"""
+    return await asyncio.gather(*(limiter.is_rate_limited_async(user, 'charter') for user in user_ids))
+
+def test_rate_limit_stores():
+    """Test that shared rate-limit stores hold limits across limiter instances"""
+    print("🔍 Testing rate limit stores...")
+    
+    try:
+        import tempfile
+        from src.rate_limiter import RateLimiter, SQLiteStore, RedisStore
+        
+        policies = {('user', 'charter'): {'type': 'token_bucket', 'rate': 0.2, 'capacity': 2}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'limits.db')
+            # Two limiters on one database stand in for two bot processes
+            first = RateLimiter(policies=policies, store=SQLiteStore(path))
+            second = RateLimiter(policies=policies, store=SQLiteStore(path))
+            hits = [first.is_rate_limited(1, 'charter')[0], second.is_rate_limited(1, 'charter')[0],
+                    first.is_rate_limited(1, 'charter')[0]]
+            # From the event loop the shared store is queried on the limiter's worker thread,
+            # concurrent checks in one transaction that sees its own writes
+            hits.append(run_coroutine(second.is_rate_limited_async(1, 'charter'))[0])
+            batch = run_coroutine(_concurrent_checks(first, [2, 2, 2]))
+            hits += [limited for limited, _ in batch]
+            first.close()
+            second.close()
+        if hits == [False, False, True, True, False, False, True]:
+            print("✅ SQLite store shares limits across processes")
+        else:
+            print(f"❌ SQLite store results: {hits}")
+            return False
+        
+        connection = FakeRESPConnection()
+        first = RateLimiter(policies=policies, store=RedisStore(connection))
+        second = RateLimiter(policies=policies, store=RedisStore(connection))
+        hits = [first.is_rate_limited(1, 'charter')[0], second.is_rate_limited(1, 'charter')[0],
+                second.is_rate_limited(1, 'charter')[0]]
+        if hits == [False, False, True] and first.get_remaining_time(1, 'charter') > 0:
+            print("✅ Redis store shares limits across processes (transaction fallback)")
+        else:
+            print(f"❌ Redis store results: {hits}")
+            return False
+        
+        # With scripting each hit is a single EVALSHA, the script is sent only when missing
+        class ScriptingConnection(FakeRESPConnection):
+            def __init__(self):
+                super().__init__()
+                self.sent = []
+            
+            def pipeline(self, *commands, raise_errors=True):
+                self.sent.append([command[0] for command in commands])
+                if commands[0][0] == 'EVALSHA' and len(self.sent) == 1:
+                    return [RedisError("Redis error: NOSCRIPT No matching script")] * len(commands)
+                return [[0, '0']] * len(commands)
+        
+        from src.rate_limiter import RedisError
+        connection = ScriptingConnection()
+        limiter = RateLimiter(policies=policies, store=RedisStore(connection))
+        for _ in range(3):
+            limiter.is_rate_limited(1, 'charter', guild_id=7)
+        if connection.sent == [['EVALSHA'], ['EVAL'], ['EVALSHA'], ['EVALSHA']]:
+            print("✅ Redis store checks each hit in one scripted round trip")
+        else:
+            print(f"❌ Redis round trips: {connection.sent}")
+            return False
+        
+        # Concurrent checks from the event loop share one pipelined round trip
+        results = run_coroutine(_concurrent_checks(limiter, range(10)))
+        limiter.close()
+        if connection.sent[4:] == [['EVALSHA'] * 10] and results == [(False, 0.0)] * 10:
+            print("✅ Redis store pipelined 10 concurrent checks into one round trip")
+        else:
+            print(f"❌ Redis batched round trips: {connection.sent[4:]}")
+            return False
+        
+        return True
+    except Exception as e:
+        print(f"❌ Rate limit store error: {e}")
+        return False
+
 def test_utils():
     """Test utility functions"""
     print("🔍 Testing utility functions...")
@@ -174,6 +429,57 @@ async def test_commands():
         print(f"❌ Commands test error: {e}")
         return False
 
+def test_embed_cache():
+    """Test the render cache for charter and policy embeds"""
+    print("🔍 Testing embed render cache...")
+    
+    try:
+        from src.data_manager import DataManager
+        from src.rate_limiter import RateLimiter
+        from src.commands import UNBotCommands
+        
+        dm = DataManager()
+        commands = UNBotCommands(dm, RateLimiter())
+        
+        cached = commands.warm_embed_cache()
+        if cached == len(dm.charter_data) + len(dm.policy_data):
+            print(f"✅ Prebuilt {cached} embeds")
+        else:
+            print(f"❌ Expected {len(dm.charter_data) + len(dm.policy_data)} cached embeds, got {cached}")
+            return False
+        
+        embed = commands.render_embed('charter', '51', lambda: None)
+        if embed.title == "UN Charter Article 51":
+            print("✅ Cached embed served without rebuilding")
+        else:
+            print(f"❌ Unexpected cached embed: {embed.title}")
+            return False
+        
+        embed.add_field(name="Extra", value="Added by one caller")
+        embed.set_field_at(0, name="Renamed", value="Edited in place")
+        embed.set_footer(text="Changed footer")
+        again = commands.render_embed('charter', '51', lambda: None)
+        if (len(again.fields) == len(embed.fields) - 1 and again.fields[0].name == "Content"
+                and again.footer.text != "Changed footer" and again.to_dict() == commands._build_charter_embed(
+                    51, dm.charter_data['51']).to_dict()):
+            print("✅ Edits to a served embed leave the cached copy untouched")
+        else:
+            print("❌ Editing a served embed changed the cached copy")
+            return False
+        
+        dm.reload()
+        commands.render_embed('policy', 'r2p', lambda: commands._build_policy_embed('r2p', dm.policy_data['r2p']))
+        if len(commands._embed_cache) == 1:
+            print("✅ Render cache invalidated on reload")
+        else:
+            print("❌ Render cache not invalidated on reload")
+            return False
+        
+        return True
+    except Exception as e:
+        print(f"❌ Embed cache error: {e}")
+        return False
+
 def test_environment():
     """Test environment configuration"""
     print("🔍 Testing environment configuration...")
@@ -231,6 +537,15 @@ def test_bot_initialization():
         print("✅ Bot components initialized successfully")
         print(f"✅ Data manager loaded: {len(dm.charter_data)} charter articles, {len(dm.policy_data)} policy terms")
         
+        # A failed login closes the bot before setup_hook has started any task
+        from bot import UNBot
+        unstarted = UNBot(command_prefix='!', intents=discord.Intents.default())
+        run_coroutine(unstarted.close())
+        if not unstarted.is_closed():
+            print("❌ Bot did not close before setup")
+            return False
+        print("✅ Bot closes cleanly before setup_hook ran")
+        
         return True
     except Exception as e:
         print(f"❌ Initialization error: {e}")
@@ -282,6 +597,906 @@ async def test_un_scraper():
         print(f"❌ UN scraper error: {e}")
         return False
 
+async def _check_scraper_cache():
+    """Serve pages from a local server and count upstream hits"""
+    from aiohttp import web
+    from src.un_scraper import UNScraper
+    
+    hits = {'count': 0, 'revalidated': 0, 'news': 0}
+    
+    async def page(request):
+        hits['count'] += 1
+        if request.headers.get('If-None-Match') == '"v1"':
+            hits['revalidated'] += 1
+            return web.Response(status=304)
+        await asyncio.sleep(0.05)
+        return web.Response(text='<a href="https://news.un.org/x">A long enough headline</a>',
+                            headers={'ETag': '"v1"'})
+    
+    async def slow_page(request):
+        await asyncio.sleep(0.3)
+        return web.Response(text='slow page')
+    
+    async def news_page(request):
+        hits['news'] += 1
+        await asyncio.sleep(0.05)
+        return web.Response(text='<a href="https://news.un.org/y">Another long enough headline</a>',
+                            headers={'ETag': '"n1"'})
+    
+    app = web.Application()
+    app.router.add_get('/', page)
+    app.router.add_get('/slow', slow_page)
+    app.router.add_get('/news', news_page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+    
+    try:
+        async with UNScraper() as scraper:
+            # A leader timing out must not cancel the shared request under a follower
+            leader = asyncio.create_task(asyncio.wait_for(scraper.fetch(f"{url}slow", 'news'), 0.1))
+            await asyncio.sleep(0)
+            follower = await scraper.fetch(f"{url}slow", 'news')
+            leader_timed_out = isinstance((await asyncio.gather(leader, return_exceptions=True))[0],
+                                          asyncio.TimeoutError)
+            shared = follower == 'slow page' and leader_timed_out
+            
+            bodies = await asyncio.gather(*(scraper.fetch(url, 'news') for _ in range(10)))
+            single_flight = hits['count'] == 1 and len(set(bodies)) == 1
+            
+            await scraper.fetch(url, 'news')
+            cached = hits['count'] == 1
+            
+            scraper.cache[url]['fetched_at'] -= 3600
+            revalidated_body = await scraper.fetch(url, 'news')
+            revalidated = hits['revalidated'] == 1 and revalidated_body == bodies[0]
+            
+            # Streamed getters share one request and cache the links rather than the body
+            scraper.base_urls['news'] = f"{url}news"
+            batches = await asyncio.gather(*(scraper.get_latest_news(5) for _ in range(10)))
+            await scraper.get_latest_news(5)
+            streamed_cached = (hits['news'] == 1 and all(len(batch) == 1 for batch in batches)
+                               and any(key[0] == f"{url}news" for key in scraper.link_cache)
+                               and f"{url}news" not in scraper.cache)
+            
+            # Extraction runs on the parse pool
+            scraper.parse_stats['completed'] = 0
+            scraper.base_urls['news'] = url
+            news = await scraper.get_latest_news(5)
+            parsed_off_loop = len(news) == 1 and scraper.parse_stats['completed'] == 1
+    finally:
+        await runner.cleanup()
+    
+    return single_flight, cached, revalidated, parsed_off_loop, shared, streamed_cached
+
+def test_scraper_cache():
+    """Test single-flight, TTL caching and conditional revalidation in UNScraper"""
+    print("🔍 Testing UN scraper response cache...")
+    
+    try:
+        single_flight, cached, revalidated, parsed_off_loop, shared, streamed_cached = run_coroutine(
+            _check_scraper_cache()
+        )
+        if single_flight and cached and revalidated and parsed_off_loop and shared and streamed_cached:
+            print("✅ Concurrent fetches collapsed, fresh hits cached, stale hits revalidated")
+            print("✅ A cancelled caller left the shared fetch running for the others")
+            print("✅ Concurrent news getters on a cold cache made one request and cached its links")
+            print("✅ Page extraction ran on the parse pool")
+            return True
+        print(f"❌ Scraper cache: single-flight={single_flight}, cached={cached}, "
+              f"revalidated={revalidated}, parsed off loop={parsed_off_loop}, shared={shared}, "
+              f"streamed cached={streamed_cached}")
+        return False
+    except Exception as e:
+        print(f"❌ Scraper cache error: {e}")
+        return False
+
+async def _check_parse_queue_depth():
+    """Hold every parse worker and slot, then read the queue depth metrics"""
+    from src.un_scraper import UNScraper
+    from src.config import SCRAPER_PARSE_QUEUE_SIZE
+    
+    release = threading.Event()
+    async with UNScraper() as scraper:
+        jobs = [asyncio.create_task(scraper.parse(release.wait, 5)) for _ in range(SCRAPER_PARSE_QUEUE_SIZE + 2)]
+        await asyncio.sleep(0.1)
+        saturated = scraper.parse_report()
+        release.set()
+        await asyncio.gather(*jobs)
+        drained = scraper.parse_report()
+    return saturated, drained
+
+def test_parse_queue_depth():
+    """Test the parse pool queue depth reported in the health log"""
+    print("🔍 Testing parse queue depth metrics...")
+    
+    try:
+        saturated, drained = run_coroutine(_check_parse_queue_depth())
+        if (saturated['queue_depth'] > 0 and saturated['peak_depth'] >= saturated['queue_depth']
+                and drained['queue_depth'] == 0 and drained['peak_depth'] > 0 and drained['completed'] > 0):
+            print(f"✅ Saturated pool reported depth {saturated['queue_depth']}, "
+                  f"drained to 0 with peak {drained['peak_depth']}")
+            return True
+        print(f"❌ Unexpected parse reports: saturated={saturated}, drained={drained}")
+        return False
+    except Exception as e:
+        print(f"❌ Parse queue depth error: {e}")
+        return False
+
+async def _check_streaming_extraction():
+    """Stream a page that stalls after its first chunk and time the extraction"""
+    import time
+    from aiohttp import web
+    from src.un_scraper import UNScraper
+    
+    state = {'dropped': False}
+    
+    async def slow_page(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        links = ''.join(f'<a href="https://news.un.org/story/{i}">Headline number {i} today</a>' for i in range(5))
+        await response.write(f"<html><body>{links}".encode())
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            state['dropped'] = True
+            raise
+        await response.write(b"</body></html>")
+        return response
+    
+    app = web.Application()
+    app.router.add_get('/', slow_page)
+    # Cancel the stalled handler once the client stops reading
+    runner = web.AppRunner(app, handler_cancellation=True)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    
+    try:
+        async with UNScraper() as scraper:
+            scraper.base_urls['news'] = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+            threads = set()
+            
+            def accept(href, title):
+                threads.add(threading.current_thread())
+                return 'un.org' in href
+            
+            started = time.perf_counter()
+            links = await scraper.stream_links(scraper.base_urls['news'], 'news', accept, 3)
+            elapsed = time.perf_counter() - started
+            # The client closed the connection instead of reading the rest of the page
+            await asyncio.sleep(0.2)
+    finally:
+        await runner.cleanup()
+    
+    return links, elapsed, state['dropped'], threading.main_thread() not in threads
+
+def test_streaming_extraction():
+    """Test that streaming extraction stops reading once enough links are found"""
+    print("🔍 Testing streaming link extraction...")
+    
+    try:
+        links, elapsed, dropped, off_loop = run_coroutine(_check_streaming_extraction())
+        if len(links) == 3 and elapsed < 2 and dropped and off_loop:
+            print(f"✅ Extracted {len(links)} links in {elapsed:.2f}s and stopped reading the page")
+            print("✅ Chunks were parsed on the stream pool")
+            return True
+        print(f"❌ Streaming extraction returned {len(links)} links in {elapsed:.2f}s, "
+              f"stopped reading={dropped}, off loop={off_loop}")
+        return False
+    except Exception as e:
+        print(f"❌ Streaming extraction error: {e}")
+        return False
+
+async def _check_latest_aggregator():
+    """Serve every update source locally, with one source stalling past its deadline"""
+    from aiohttp import web
+    from src.un_scraper import UNScraper
+    from src.config import SCRAPER_SOURCE_DEADLINES
+    
+    async def news(request):
+        return web.Response(text='<a href="https://news.un.org/story/1">Shared headline about peace</a>'
+                                 '<a href="https://news.un.org/story/2">Second news headline here</a>',
+                            content_type='text/html')
+    
+    async def press(request):
+        # Links to the same story as UN News, which must be deduplicated
+        return web.Response(text='<a href="https://news.un.org/story/1/">Shared headline about peace</a>'
+                                 '<a href="https://press.un.org/en/2024/sc1.doc.htm">Press release on Council</a>',
+                            content_type='text/html')
+    
+    async def stalled(request):
+        await asyncio.sleep(5)
+        return web.Response(text='')
+    
+    app = web.Application()
+    app.router.add_get('/news', news)
+    app.router.add_get('/press', press)
+    app.router.add_get('/stalled', stalled)
+    runner = web.AppRunner(app, handler_cancellation=True)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    
+    saved_deadlines = dict(SCRAPER_SOURCE_DEADLINES)
+    SCRAPER_SOURCE_DEADLINES.update({source: 0.3 for source in SCRAPER_SOURCE_DEADLINES})
+    try:
+        async with UNScraper() as scraper:
+            scraper.base_urls.update({
+                'news': f"{base}/news", 'press': f"{base}/press", 'security_council': f"{base}/stalled",
+                'general_assembly': f"{base}/stalled", 'digital_library': f"{base}/stalled"
+            })
+            return await scraper.get_latest_updates(limit=10)
+    finally:
+        SCRAPER_SOURCE_DEADLINES.update(saved_deadlines)
+        await runner.cleanup()
+
+def test_latest_aggregator():
+    """Test concurrent fan-out, deduplication and partial results for /latest"""
+    print("🔍 Testing latest updates aggregator...")
+    
+    try:
+        items, missing = run_coroutine(_check_latest_aggregator())
+        titles = [item['title'] for item in items]
+        if len(items) == 3 and titles.count('Shared headline about peace') == 1 and len(missing) == 3:
+            print(f"✅ Merged {len(items)} items, skipped slow sources: {', '.join(missing)}")
+            return True
+        print(f"❌ Aggregator returned {titles}, missing {missing}")
+        return False
+    except Exception as e:
+        print(f"❌ Aggregator error: {e}")
+        return False
+
+async def _check_circuit_breaker():
+    """Degrade a local upstream and check the scraper fails fast to its cached copy"""
+    from aiohttp import web
+    from src.un_scraper import UNScraper, CircuitBreaker
+    
+    state = {'status': 200, 'hits': 0}
+    
+    async def page(request):
+        state['hits'] += 1
+        return web.Response(text='<html>cached copy</html>', status=state['status'], content_type='text/html')
+    
+    async def slow_page(request):
+        await asyncio.sleep(1)
+        return web.Response(text='slow')
+    
+    app = web.Application()
+    app.router.add_get('/', page)
+    app.router.add_get('/slow', slow_page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host = f"127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    url = f"http://{host}/"
+    
+    try:
+        async with UNScraper() as scraper:
+            breaker = scraper.breakers[host] = CircuitBreaker(failure_threshold=2, reset_after=60)
+            await scraper.fetch(url, 'news')
+            
+            state['status'] = 503
+            scraper.cache[url]['fetched_at'] -= 3600
+            stale = await scraper.fetch(url, 'news')
+            opened = breaker.state == 'open'
+            
+            hits = state['hits']
+            scraper.cache[url]['fetched_at'] -= 3600
+            fast = await scraper.fetch(url, 'news')
+            failed_fast = state['hits'] == hits and fast == stale == '<html>cached copy</html>'
+            
+            # A half-open probe cut off by a deadline must not wedge the breaker
+            state['status'] = 200
+            breaker.opened_at -= 60
+            probe = scraper.request(f"{url}slow", lambda response: response.text())
+            await asyncio.gather(asyncio.wait_for(probe, 0.05), return_exceptions=True)
+            scraper.cache[url]['fetched_at'] -= 3600
+            await scraper.fetch(url, 'news')
+            recovered = breaker.state == 'closed'
+    finally:
+        await runner.cleanup()
+    
+    adaptive = CircuitBreaker()
+    adaptive.latencies.extend([0.1] * 50)
+    return opened, failed_fast, recovered, adaptive.timeout()
+
+def test_circuit_breaker():
+    """Test circuit breaking, stale-cache fallback and adaptive timeouts in UNScraper"""
+    print("🔍 Testing scraper circuit breaker...")
+    
+    try:
+        from src.config import SCRAPER_MIN_TIMEOUT
+        opened, failed_fast, recovered, timeout = run_coroutine(_check_circuit_breaker())
+        if opened and failed_fast and recovered and timeout == SCRAPER_MIN_TIMEOUT:
+            print("✅ Circuit opened on 5xx and requests fell back to the cached page")
+            print("✅ Circuit closed again after a cancelled half-open probe")
+            print(f"✅ Timeout adapted to {timeout}s from observed latency")
+            return True
+        print(f"❌ Circuit breaker: opened={opened}, failed fast={failed_fast}, recovered={recovered}, "
+              f"timeout={timeout}")
+        return False
+    except Exception as e:
+        print(f"❌ Circuit breaker error: {e}")
+        return False
+
+async def _check_feed_scheduler():
+    """Refresh a scheduler against a stub scraper and serve /latest from its snapshot"""
+    from src.feed_scheduler import FeedScheduler
+    from src.data_manager import DataManager
+    from src.rate_limiter import RateLimiter
+    from src.commands import UNBotCommands
+    from src.config import FEED_SOURCE_DEADLINE
+    
+    scraper = Mock()
+    scraper.get_latest_updates = AsyncMock(return_value=(
+        [{'title': 'Council adopts resolution', 'url': 'https://press.un.org/x', 'source': 'UN Press'}], []
+    ))
+    feeds = FeedScheduler(scraper, interval=60, jitter=0, retry_base=10, max_backoff=25)
+    published = await feeds.refresh() and len(feeds.snapshot.items) == 1
+    # Background refreshes get their own, longer per-source deadlines
+    published = published and scraper.get_latest_updates.call_args.kwargs['deadlines'] == {
+        source: FEED_SOURCE_DEADLINE for source in feeds.sources
+    }
+    
+    scraper.get_latest_updates.side_effect = RuntimeError("upstream down")
+    kept = not await feeds.refresh() and len(feeds.snapshot.items) == 1
+    delays = []
+    for failures in range(4):
+        feeds.failures = failures
+        delays.append(feeds.next_delay())
+    
+    commands = UNBotCommands(DataManager(), RateLimiter(), scraper, feeds)
+    interaction = Mock()
+    interaction.user.id = 42
+    interaction.guild_id = None
+    interaction.response = AsyncMock()
+    calls_before = scraper.get_latest_updates.call_count
+    await commands.latest(interaction)
+    embed = interaction.response.send_message.call_args.kwargs['embed']
+    served = (scraper.get_latest_updates.call_count == calls_before
+              and 'Council adopts resolution' in embed.fields[0].value)
+    
+    return published, kept, delays, served
+
+def test_feed_scheduler():
+    """Test snapshot publishing, backoff and snapshot-backed /latest"""
+    print("🔍 Testing feed scheduler...")
+    
+    try:
+        published, kept, delays, served = run_coroutine(_check_feed_scheduler())
+        if published and kept and delays == [60, 10, 20, 25] and served:
+            print("✅ Snapshot published, kept on failure, backoff capped, /latest served from snapshot")
+            return True
+        print(f"❌ Feed scheduler: published={published}, kept={kept}, delays={delays}, served={served}")
+        return False
+    except Exception as e:
+        print(f"❌ Feed scheduler error: {e}")
+        return False
+
+def test_charter_ingest():
+    """Test parsing the official Charter page into the Charter data shape"""
+    print("🔍 Testing Charter ingestion...")
+    
+    try:
+        import tempfile
+        from src.un_scraper import parse_charter
+        from src.data_manager import DataManager
+        
+        html = (
+            "<h3>Chapter I: Purposes and Principles</h3>"
+            "<h4>Article 1</h4><p>The Purposes of the United Nations are:</p><p>1. To maintain peace</p>"
+            "<h3>Chapter VII: Action with Respect to Threats to the Peace</h3>"
+            "<h4>Article 42</h4><p>Should the Security Council consider...</p>"
+        )
+        articles = parse_charter(html)
+        if (list(articles) == ['1', '42'] and articles['42']['title'].startswith('Action')
+                and articles['1']['content'].count('\n\n') == 1):
+            print(f"✅ Parsed {len(articles)} articles")
+        else:
+            print(f"❌ Unexpected parse result: {articles}")
+            return False
+        
+        dm = DataManager()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'charter.json')
+            dm.store_charter_online(articles, path=path)
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        if stored == articles and dm.get_charter_article(42) == articles['42']:
+            print("✅ Ingested articles persisted and served by DataManager")
+        else:
+            print("❌ Ingested articles not served")
+            return False
+        
+        return True
+    except Exception as e:
+        print(f"❌ Charter ingestion error: {e}")
+        return False
+
+async def _check_resolution_lookup(catalog):
+    """Answer /resolution from the catalog, falling back to a stub Digital Library search"""
+    from src.data_manager import DataManager
+    from src.rate_limiter import RateLimiter
+    from src.commands import UNBotCommands
+    
+    scraper = Mock()
+    scraper.search_resolution = AsyncMock(return_value={
+        'type': 'GA', 'number': 12, 'title': 'Resolution 12 on oceans A/RES/12',
+        'url': 'https://digitallibrary.un.org/record/12'
+    })
+    commands = UNBotCommands(DataManager(), RateLimiter(), scraper, catalog=catalog)
+    interaction = Mock()
+    interaction.user.id = 42
+    interaction.guild_id = None
+    interaction.response = AsyncMock()
+    
+    # Record the threads SQLite is called from, which must not be the event loop's
+    threads = set()
+    for name in ('get', 'add_many'):
+        def spy(*args, method=getattr(catalog, name)):
+            threads.add(threading.current_thread())
+            return method(*args)
+        setattr(catalog, name, spy)
+    
+    await commands.resolution(interaction, 'sc', 2707)
+    embed = interaction.response.send_message.call_args.kwargs['embed']
+    local = (scraper.search_resolution.call_count == 0 and embed.description == 'Children and armed conflict'
+             and embed.fields[0].value == '14 June 2023')
+    
+    fetched = await commands.lookup_resolution('ga', 12)
+    written_back = fetched is not None and (await catalog.get_async('ga', 12))['url'] == fetched['url']
+    
+    # A loose search hit on another resolution is shown but never stored under this number
+    scraper.search_resolution.return_value = {
+        'type': 'SC', 'number': 71, 'title': 'Resolution 2712 (2023) S/RES/2712 (2023)',
+        'url': 'https://digitallibrary.un.org/record/2712'
+    }
+    await commands.lookup_resolution('sc', 71)
+    written_back = written_back and await catalog.get_async('sc', 71) is None
+    del catalog.get, catalog.add_many
+    return local, written_back and threading.current_thread() not in threads
+
+def test_resolution_catalog():
+    """Test resolution listing ingestion and indexed /resolution lookups"""
+    print("🔍 Testing resolution catalog...")
+    
+    try:
+        import tempfile
+        from datetime import date
+        from src.un_scraper import extract_resolution_listing
+        from src.resolution_catalog import ResolutionCatalog, current_periods
+        
+        html = (
+            "<table><tr><th>Resolution</th><th>Date</th><th>Subject</th></tr>"
+            "<tr><td><a href='/en/S/RES/2707(2023)'>S/RES/2707 (2023)</a></td><td>14 June 2023</td>"
+            "<td>Children and armed conflict</td></tr>"
+            "<tr><td><a href='/en/S/RES/2708(2023)'>S/RES/2708 (2023)</a></td><td>14 June 2023</td>"
+            "<td>The situation in Somalia</td></tr></table>"
+        )
+        records = extract_resolution_listing(html, 'SC', 'https://www.un.org/securitycouncil/')
+        if len(records) != 2 or records[0]['url'] != 'https://www.un.org/en/S/RES/2707(2023)':
+            print(f"❌ Unexpected listing parse: {records}")
+            return False
+        print(f"✅ Parsed {len(records)} resolutions from a listing page")
+        
+        if current_periods(date(2023, 10, 1)) != [('SC', 2023), ('GA', 78)]:
+            print(f"❌ Wrong ingestion periods: {current_periods(date(2023, 10, 1))}")
+            return False
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            catalog = ResolutionCatalog(os.path.join(tmp, 'resolutions.db'))
+            try:
+                catalog.add_many(records)
+                local, written_back = run_coroutine(_check_resolution_lookup(catalog))
+            finally:
+                catalog.close()
+        
+        if local and written_back:
+            print("✅ Catalog answered by primary key and saved an on-miss fetch, off the event loop")
+            return True
+        print(f"❌ Resolution lookup: local={local}, written back={written_back}")
+        return False
+    except Exception as e:
+        print(f"❌ Resolution catalog error: {e}")
+        return False
+
+async def _check_deferred_replies():
+    """Run a fast and a slow /latest through the execution wrapper with a short threshold"""
+    import src.commands
+    from src.data_manager import DataManager
+    from src.rate_limiter import RateLimiter
+    from src.commands import UNBotCommands
+    
+    async def slow_updates(*args, **kwargs):
+        await asyncio.sleep(0.3)
+        return [{'title': 'Council adopts resolution', 'url': 'https://press.un.org/x', 'source': 'UN Press'}], []
+    
+    def make_interaction(interaction_id):
+        interaction = Mock()
+        interaction.id = interaction_id
+        interaction.user.id = interaction_id
+        interaction.guild_id = None
+        interaction.response = AsyncMock()
+        interaction.followup = AsyncMock()
+        interaction.delete_original_response = AsyncMock()
+        return interaction
+    
+    scraper = Mock()
+    scraper.get_latest_updates = slow_updates
+    commands = UNBotCommands(DataManager(), RateLimiter(), scraper)
+    saved_threshold = src.commands.INTERACTION_DEFER_AFTER
+    src.commands.INTERACTION_DEFER_AFTER = 0.1
+    try:
+        fast = make_interaction(1)
+        await commands.run(fast, commands.help_command)
+        answered = fast.response.send_message.called and not fast.response.defer.called
+        
+        slow = make_interaction(2)
+        await commands.run(slow, commands.latest)
+        deferred = (slow.response.defer.called and not slow.response.send_message.called
+                    and 'embed' in slow.followup.send.call_args.kwargs)
+        
+        failing = make_interaction(3)
+        broken = AsyncMock(side_effect=RuntimeError("boom"), __name__='broken')
+        await commands.run(failing, broken, error="❌ failed")
+        reported = failing.response.send_message.call_args.args[0] == "❌ failed"
+        
+        # An ephemeral error after deferring removes the public placeholder before following up
+        async def slow_failure(interaction):
+            await asyncio.sleep(0.3)
+            raise RuntimeError("boom")
+        
+        late = make_interaction(4)
+        await commands.run(late, slow_failure, error="❌ failed")
+        reported = (reported and late.response.defer.called and late.delete_original_response.called
+                    and late.followup.send.call_args.kwargs.get('ephemeral') is True)
+        deferred = deferred and not slow.delete_original_response.called
+    finally:
+        src.commands.INTERACTION_DEFER_AFTER = saved_threshold
+    
+    return answered, deferred, reported, not commands._reply_locks
+
+def test_deferred_replies():
+    """Test that slow commands are deferred and answered through followups"""
+    print("🔍 Testing deferred interaction replies...")
+    
+    try:
+        answered, deferred, reported, cleaned_up = run_coroutine(_check_deferred_replies())
+        if answered and deferred and reported and cleaned_up:
+            print("✅ Fast handler answered directly, slow handler deferred and followed up")
+            print("✅ Handler errors reported to the user, privately even after deferring")
+            return True
+        print(f"❌ Deferred replies: answered={answered}, deferred={deferred}, "
+              f"reported={reported}, cleaned up={cleaned_up}")
+        return False
+    except Exception as e:
+        print(f"❌ Deferred replies error: {e}")
+        return False
+
+def test_autocomplete():
+    """Test prefix-index autocomplete for policy terms, charter articles and search topics"""
+    print("🔍 Testing autocomplete...")
+    
+    try:
+        import time
+        from src.data_manager import DataManager
+        from src.rate_limiter import RateLimiter
+        from src.commands import UNBotCommands
+        
+        dm = DataManager()
+        policy_keys = [key for _, key in dm.complete_policy_terms('prot')]
+        if 'r2p' not in policy_keys:
+            print(f"❌ 'prot' did not complete to r2p: {policy_keys}")
+            return False
+        
+        articles = [article for _, article in dm.complete_charter_articles('self')]
+        if articles[:1] != [51]:
+            print(f"❌ 'self' did not complete to Article 51: {articles}")
+            return False
+        print("✅ Prefixes complete on any word of policy names and article titles")
+        
+        commands = UNBotCommands(dm, RateLimiter())
+        choices = run_coroutine(commands.charter_autocomplete(Mock(), '5'))
+        if not choices or len(choices) > 25 or not all(isinstance(c.value, int) for c in choices):
+            print(f"❌ Unexpected charter choices: {choices}")
+            return False
+        
+        started = time.perf_counter()
+        for _ in range(1000):
+            dm.complete_search_queries('s')
+        per_call = (time.perf_counter() - started) / 1000 * 1000
+        if per_call < 5:
+            print(f"✅ {len(choices)} charter choices, {per_call:.3f}ms per completion")
+            return True
+        print(f"❌ Completion took {per_call:.3f}ms")
+        return False
+    except Exception as e:
+        print(f"❌ Autocomplete error: {e}")
+        return False
+
+async def _check_hot_reload(dm, policy_path):
+    """Edit the policy file under a running watcher and wait for the swap"""
+    old_snapshot = dm.snapshot
+    old_version = dm.version
+    watcher = asyncio.create_task(dm.watch(interval=0.05))
+    try:
+        with open(policy_path, 'r', encoding='utf-8') as f:
+            policies = json.load(f)
+        policies['hot_reload_term'] = {'title': 'Hot Reload Term', 'description': 'Added while running'}
+        with open(policy_path, 'w', encoding='utf-8') as f:
+            json.dump(policies, f)
+        # Make sure the change is visible even on filesystems with coarse timestamps
+        mtime = dict(dm.file_stamps)[policy_path] + 5
+        os.utime(policy_path, (mtime, mtime))
+        
+        for _ in range(40):
+            if dm.version != old_version:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        watcher.cancel()
+    
+    swapped = dm.version == old_version + 1 and dm.get_policy_term('Hot Reload Term') is not None
+    untouched = 'hot_reload_term' not in old_snapshot.policy_data and dm.snapshot is not old_snapshot
+    
+    # A half-saved file must fail the reload and leave the current snapshot serving
+    with open(policy_path, 'r+', encoding='utf-8') as f:
+        f.truncate(100)
+    current = dm.snapshot
+    try:
+        await dm.reload_async()
+        kept = False
+    except ValueError:
+        kept = dm.snapshot is current and dm.get_policy_term('r2p') is not None
+    
+    # The watcher tries the invalid file once, not on every poll, and retries once it changes
+    reload_async = dm.reload_async
+    attempts = []
+    
+    async def counting_reload():
+        attempts.append(dm.data_file_stamps())
+        await reload_async()
+    
+    dm.reload_async = counting_reload
+    watcher = asyncio.create_task(dm.watch(interval=0.02))
+    try:
+        await asyncio.sleep(0.2)
+        tried_once = len(attempts) == 1
+        with open(policy_path, 'w', encoding='utf-8') as f:
+            json.dump(policies, f)
+        mtime = dict(dm.file_stamps)[policy_path] + 10
+        os.utime(policy_path, (mtime, mtime))
+        for _ in range(40):
+            if dm.snapshot is not current:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        watcher.cancel()
+        del dm.reload_async
+    kept = kept and tried_once and len(attempts) == 2 and dm.snapshot is not current
+    return swapped, untouched, kept
+
+def test_hot_reload():
+    """Test that edited data files are reloaded in the background and swapped in whole"""
+    print("🔍 Testing hot reload...")
+    
+    try:
+        import shutil
+        import tempfile
+        import src.data_manager
+        from src.data_manager import DataManager
+        
+        saved_path = src.data_manager.POLICY_FILE
+        with tempfile.TemporaryDirectory() as tmp:
+            policy_path = os.path.join(tmp, 'policy_definitions.json')
+            shutil.copy(saved_path, policy_path)
+            src.data_manager.POLICY_FILE = policy_path
+            try:
+                dm = DataManager()
+                swapped, untouched, kept = run_coroutine(_check_hot_reload(dm, policy_path))
+            finally:
+                src.data_manager.POLICY_FILE = saved_path
+        
+        if swapped and untouched and kept:
+            print("✅ Watcher reloaded the edited file and swapped in a new snapshot")
+            print("✅ An invalid file failed the reload once and kept the current data until fixed")
+            return True
+        print(f"❌ Hot reload: swapped={swapped}, old snapshot untouched={untouched}, kept on bad file={kept}")
+        return False
+    except Exception as e:
+        print(f"❌ Hot reload error: {e}")
+        return False
+
+def test_sharding():
+    """Test shard range assignment and per-shard health reports"""
+    print("🔍 Testing sharding helpers...")
+    
+    try:
+        from src.sharding import parse_shard_ids, format_shard_ids, shard_ranges, is_primary, shard_health
+        
+        ranges = shard_ranges(10, 4)
+        covered = sorted(shard for shard_ids in ranges for shard in shard_ids)
+        if covered != list(range(10)) or [len(r) for r in ranges] != [3, 3, 2, 2]:
+            print(f"❌ Unexpected shard ranges: {ranges}")
+            return False
+        if parse_shard_ids(format_shard_ids(ranges[1])) != ranges[1] or parse_shard_ids('0,2-3') != [0, 2, 3]:
+            print("❌ Shard id specs do not round-trip")
+            return False
+        if not is_primary(None) or not is_primary([0, 1]) or is_primary([2, 3]):
+            print("❌ Wrong primary process detection")
+            return False
+        print(f"✅ 10 shards split over 4 processes: {[format_shard_ids(r) for r in ranges]}")
+        
+        def fake_shard(latency):
+            shard = Mock(latency=latency)
+            shard.is_closed.return_value = False
+            shard.is_ws_ratelimited.return_value = False
+            return shard
+        
+        bot = Mock()
+        bot.shards = {3: fake_shard(0.05), 2: fake_shard(float('nan'))}
+        bot.guilds = [Mock(shard_id=2), Mock(shard_id=3), Mock(shard_id=3)]
+        report = shard_health(bot)
+        if ([(s['shard_id'], s['guilds'], s['latency_ms']) for s in report]
+                == [(2, 1, None), (3, 2, 50.0)]):
+            print("✅ Health reported per shard")
+            return True
+        print(f"❌ Unexpected health report: {report}")
+        return False
+    except Exception as e:
+        print(f"❌ Sharding error: {e}")
+        return False
+
+def test_logging_pipeline():
+    """Test queued logging with sampling and size-based rotation"""
+    print("🔍 Testing logging pipeline...")
+    
+    import logging
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        import tempfile
+        from src.logging_setup import setup_logging, stop_logging
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bot.log')
+            listener = setup_logging(path=path, max_bytes=2000, backup_count=2,
+                                     sample_rates={'test.sampled': 10})
+            sampled = logging.getLogger('test.sampled')
+            for i in range(25):
+                sampled.info("Charter article %s requested by %s", i, 'tester')
+            sampled.warning("Upstream slow")
+            for i in range(40):
+                logging.getLogger('test.volume').info("Filler line %s", i)
+            stop_logging(listener)
+            
+            lines = ''
+            for name in (f"{path}.2", f"{path}.1", path):
+                if os.path.exists(name):
+                    with open(name, 'r', encoding='utf-8') as f:
+                        lines += f.read()
+            rotated = os.path.exists(f"{path}.1") and os.path.getsize(path) <= 2000
+            for handler in listener.handlers:
+                handler.close()
+        
+        kept = lines.count('requested by tester')
+        if kept == 3 and 'Upstream slow' in lines and rotated:
+            print(f"✅ Sampled high-volume lines to {kept}/25, log rotated at the size limit")
+            return True
+        print(f"❌ Logging pipeline: kept {kept}/25 sampled lines, rotated={rotated}")
+        return False
+    except Exception as e:
+        print(f"❌ Logging pipeline error: {e}")
+        return False
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+async def _check_command_sync(path):
+    """Sync a small tree repeatedly with the Discord call stubbed out"""
+    from discord.ext import commands
+    from src.command_sync import sync_commands
+    
+    bot = commands.Bot(command_prefix='!', intents=discord.Intents.default())
+    
+    @bot.tree.command(name="charter", description="Charter article")
+    async def charter(interaction: discord.Interaction, article: int):
+        pass
+    
+    bot.tree.sync = AsyncMock(return_value=[])
+    runs = [await sync_commands(bot.tree, path=path), await sync_commands(bot.tree, path=path)]
+    
+    @bot.tree.command(name="policy", description="Policy term")
+    async def policy(interaction: discord.Interaction, term: str):
+        pass
+    
+    runs.append(await sync_commands(bot.tree, path=path))
+    runs.append(await sync_commands(bot.tree, guild_id=1234, path=path))
+    guild_synced = bot.tree.sync.call_args.kwargs['guild'].id == 1234
+    return runs, guild_synced
+
+def test_command_sync():
+    """Test that the command tree is only synced when its definitions change"""
+    print("🔍 Testing conditional command sync...")
+    
+    try:
+        import tempfile
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            runs, guild_synced = run_coroutine(_check_command_sync(os.path.join(tmp, 'command_sync.json')))
+        
+        if runs == [True, False, True, True] and guild_synced:
+            print("✅ Unchanged tree skipped, changed tree and dev guild synced")
+            return True
+        print(f"❌ Sync runs {runs}, guild synced={guild_synced}")
+        return False
+    except Exception as e:
+        print(f"❌ Command sync error: {e}")
+        return False
+
+def test_load_harness():
+    """Smoke-run the load harness for a fraction of a second"""
+    print("🔍 Testing load harness...")
+    
+    try:
+        from tests.load_harness import run_load, build_commands, parse_mix, DEFAULT_MIX
+        
+        report = run_coroutine(run_load(200, 0.5, parse_mix(DEFAULT_MIX), users=10000,
+                                        commands=build_commands(user_limits_only=True)))
+        if report['sent'] == 100 and report['errors'] == 0 and report['latency_ms']['p99'] is not None:
+            print(f"✅ {report['sent']} interactions at {report['throughput']}/s, "
+                  f"p99 {report['latency_ms']['p99']}ms, loop lag p99 {report['loop_lag_ms']['p99']}ms")
+            return True
+        print(f"❌ Unexpected load report: {report}")
+        return False
+    except Exception as e:
+        print(f"❌ Load harness error: {e}")
+        return False
+
+def test_benchmarks():
+    """Smoke-run the micro-benchmarks at a small scale and check baseline comparison"""
+    print("🔍 Testing micro-benchmarks...")
+    
+    try:
+        from tests.benchmarks import run_benchmarks, compare, scale_corpus, load_json
+        from src.config import CHARTER_FILE, POLICY_FILE
+        
+        charter, policies = load_json(CHARTER_FILE), load_json(POLICY_FILE)
+        scaled_charter, scaled_policies = scale_corpus(charter, policies, 3)
+        if len(scaled_charter) != 3 * len(charter) or len(scaled_policies) != 3 * len(policies):
+            print(f"❌ Scaled corpus has {len(scaled_charter)} articles and {len(scaled_policies)} terms")
+            return False
+        
+        current = run_benchmarks([2], budget=0.01)
+        expected = {'sanitize_input[1x]', 'create_embed[1x]', 'search_charter[2x]', 'get_policy_term[2x]',
+                    'suggest_policy_terms[2x]', 'is_rate_limited[2x]', 'split_content[2x]',
+                    'render_embed_build[1x]', 'render_embed_hit[1x]'}
+        if not expected <= set(current['results']):
+            print(f"❌ Missing benchmarks: {expected - set(current['results'])}")
+            return False
+        
+        # A baseline twice as fast flags everything, one twice as slow flags nothing
+        faster = {'results': {key: {'median_us': result['median_us'] / 2} for key, result in current['results'].items()}}
+        slower = {'results': {key: {'median_us': result['median_us'] * 2} for key, result in current['results'].items()}}
+        against_faster, against_slower = compare(current, faster), compare(current, slower)
+        if len(against_faster) == len(current['results']) and not against_slower:
+            print(f"✅ {len(current['results'])} benchmarks ran and regressions were detected")
+            return True
+        print(f"❌ Comparison found {len(against_faster)} regressions against a faster baseline "
+              f"and {len(against_slower)} against a slower one")
+        return False
+    except Exception as e:
+        print(f"❌ Benchmark error: {e}")
+        return False
+
 async def main():
     """Run comprehensive tests"""
     print("🧪 Running comprehensive UN Bot tests...")
@@ -294,10 +1509,30 @@ async def main():
         ("Bot Imports", test_bot_imports),
         ("Bot Initialization", test_bot_initialization),
         ("Data Manager", test_data_manager),
+        ("Search Index", test_search_index),
+        ("Rate Limiter", test_rate_limiter),
+        ("Rate Limit Stores", test_rate_limit_stores),
         ("Utility Functions", test_utils),
         ("Slash Commands", test_slash_commands),
         ("Command Handlers", test_commands),
-        ("UN Scraper", test_un_scraper)
+        ("Embed Cache", test_embed_cache),
+        ("UN Scraper", test_un_scraper),
+        ("UN Scraper Cache", test_scraper_cache),
+        ("Parse Queue Depth", test_parse_queue_depth),
+        ("Streaming Extraction", test_streaming_extraction),
+        ("Latest Aggregator", test_latest_aggregator),
+        ("Circuit Breaker", test_circuit_breaker),
+        ("Feed Scheduler", test_feed_scheduler),
+        ("Charter Ingestion", test_charter_ingest),
+        ("Resolution Catalog", test_resolution_catalog),
+        ("Deferred Replies", test_deferred_replies),
+        ("Autocomplete", test_autocomplete),
+        ("Hot Reload", test_hot_reload),
+        ("Sharding", test_sharding),
+        ("Logging Pipeline", test_logging_pipeline),
+        ("Command Sync", test_command_sync),
+        ("Load Harness", test_load_harness),
+        ("Benchmarks", test_benchmarks)
     ]
     
     all_passed = True